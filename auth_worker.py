@@ -0,0 +1,43 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from database import release_thread
+
+
+class AuthWorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class AuthWorker(QRunnable):
+    """
+    Runs one UserManager call (register_user, validate_login, update_user_info) on a
+    thread pool so bcrypt hashing never blocks the Qt event loop.
+    The call's return value is delivered through signals.finished.
+    """
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.signals = AuthWorkerSignals()
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            release_thread()
+        self.signals.finished.emit(result)
+
+
+def start_auth_worker(fn, *args, on_finished, on_failed, pool=None):
+    """
+    Start an AuthWorker for fn(*args) and return it.
+    Callers should keep the returned worker until it reports back so its signals stay alive.
+    """
+    worker = AuthWorker(fn, *args)
+    worker.signals.finished.connect(on_finished)
+    worker.signals.failed.connect(on_failed)
+    (pool or QThreadPool.globalInstance()).start(worker)
+    return worker
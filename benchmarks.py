@@ -0,0 +1,268 @@
+"""
+Benchmark suite for catching performance regressions. Runs headless: charts are rendered on
+Qt's offscreen platform and databases live in a temporary directory.
+
+    python benchmarks.py run [--quick] [--only calculator,persistence,auth,charts] [--output results.json]
+    python benchmarks.py compare baseline.json results.json [--threshold 0.25]
+
+run prints the results as JSON (or writes them to --output); compare exits with status 1 when
+any benchmark's median got slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+GROUPS = ("calculator", "persistence", "auth", "charts")
+
+
+def _measure(fn, number=1, repeat=5, setup=None):
+    # Time `number` calls `repeat` times and report seconds per call. The median is what
+    # compare looks at; min shows the best case the machine managed.
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median": statistics.median(samples), "min": min(samples), "calls": number * repeat}
+
+
+def bench_calculator(quick):
+    import numpy as np
+    from retirement_calculator import (calculate_retirement, calculate_retirement_yearly,
+                                       calculate_retirement_batch, calculate_retirement_yearly_batch)
+    results = {}
+    for years in (10, 50, 100):
+        results[f"calculate_retirement[years={years}]"] = _measure(
+            lambda: calculate_retirement(10000, 6, years, 5000), number=2000)
+    for years in (10, 50, 1000) if quick else (10, 50, 100, 1000):
+        for method in ("loop", "cumprod"):
+            results[f"calculate_retirement_yearly[{method},years={years}]"] = _measure(
+                lambda: calculate_retirement_yearly(10000, 6, years, 5000, method), number=200)
+    rng = np.random.default_rng(0)
+    for size in (1000, 10000) if quick else (1000, 10000, 100000):
+        initial = rng.uniform(0, 100000, size)
+        rates = rng.uniform(0, 12, size)
+        horizons = rng.integers(1, 60, size)
+        contributions = rng.uniform(0, 20000, size)
+        results[f"calculate_retirement_batch[n={size}]"] = _measure(
+            lambda: calculate_retirement_batch(initial, rates, horizons, contributions), number=3)
+        results[f"calculate_retirement_yearly_batch[n={size}]"] = _measure(
+            lambda: calculate_retirement_yearly_batch(initial, rates, horizons, contributions), number=1)
+    return results
+
+
+def bench_persistence(quick):
+    from database import get_provider, close_all
+    from data_manager import DataManager
+    from retirement_calculator import calculate_retirement
+    result = calculate_retirement(10000, 6, 30, 5000)
+    totals = {"total_income": 5000.0, "total_expenses": 3200.0, "remaining_balance": 1800.0}
+    incomes = {"Salary": 5000.0}
+    expenses = {"Needs": {"Rent": 2000.0}, "Wants": {"Dining": 700.0}, "Savings": {"IRA": 500.0}}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for users in (1000, 10000) if quick else (1000, 10000, 100000):
+            db = os.path.join(tmp, f"bench_{users}.db")
+            dm = DataManager(db)
+            retirement_rows = [(user_id, 10000, 6, 30, 5000, result) for user_id in range(users)]
+            budget_rows = [(user_id, incomes, expenses, totals) for user_id in range(users)]
+            results[f"save_many[retirement,users={users}]"] = _measure(
+                lambda: dm.save_many(retirement_results=retirement_rows), repeat=3)
+            results[f"save_many[budget,users={users}]"] = _measure(
+                lambda: dm.save_many(budget_summaries=budget_rows), repeat=3)
+            user_ids = iter(range(10 ** 9))
+            results[f"upsert_retirement_result[users={users}]"] = _measure(
+                lambda: dm.upsert_retirement_result(next(user_ids) % users, 10000, 6, 30, 5000, result), number=200)
+            results[f"upsert_budget_summary[users={users}]"] = _measure(
+                lambda: dm.upsert_budget_summary(next(user_ids) % users, incomes, expenses, totals), number=200)
+            cache = get_provider(db).cache
+            results[f"get_retirement_result[uncached,users={users}]"] = _measure(
+                lambda: (cache.invalidate(), dm.get_retirement_result(next(user_ids) % users)), number=1000)
+            results[f"get_retirement_result[cached,users={users}]"] = _measure(
+                lambda: dm.get_retirement_result(users // 2), number=10000)
+            results[f"get_budget_items[users={users}]"] = _measure(
+                lambda: dm.get_budget_items(next(user_ids) % users), number=1000)
+            dm.close()
+        close_all()
+    return results
+
+
+def bench_auth(quick):
+    from database import close_all
+    from user_manager import UserManager, BCRYPT_ROUNDS
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        um = UserManager(os.path.join(tmp, "bench_auth.db"))
+        um.register_user("bench@example.com", "Bench", "User", "correct horse")
+        repeat = 3 if quick else 5
+        results[f"validate_login[success,rounds={BCRYPT_ROUNDS}]"] = _measure(
+            lambda: um.validate_login("bench@example.com", "correct horse"), repeat=repeat)
+        results[f"validate_login[wrong_password,rounds={BCRYPT_ROUNDS}]"] = _measure(
+            lambda: um.validate_login("bench@example.com", "wrong"), repeat=repeat)
+        results["validate_login[unknown_user]"] = _measure(
+            lambda: um.validate_login("nobody@example.com", "wrong"), number=1000)
+        results["get_user[cached]"] = _measure(lambda: um.get_user("bench@example.com"), number=10000)
+        _, token = um.login("bench@example.com", "correct horse")
+        results["validate_session[valid]"] = _measure(lambda: um.validate_session(token), number=10000)
+        forged = token[:-4] + "AAAA"
+        results["validate_session[forged]"] = _measure(lambda: um.validate_session(forged), number=10000)
+        close_all()
+    return results
+
+
+def bench_charts(quick):
+    from PyQt5.QtWidgets import QApplication
+    from charts import BarChartWidget, PieChartWidget
+    from retirement_calculator import calculate_retirement_yearly
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    def render(widget, *args):
+        # update_chart may defer a full redraw to the event loop, so let it run.
+        widget.update_chart(*args)
+        app.processEvents()
+
+    results = {}
+    for years in (30, 80, 400) if quick else (30, 80, 400, 3000):
+        # Small input changes, as when typing, keep the axes and exercise the in-place update path.
+        series = [calculate_retirement_yearly(10000 + i * 100, 1, years, 5000) for i in range(8)]
+        steps = iter(range(10 ** 9))
+
+        def fresh():
+            widget = BarChartWidget()
+            widget.resize(500, 300)
+            widget.show()
+            app.processEvents()
+            bars.append(widget)
+
+        bars = []
+        results[f"BarChartWidget.first_render[years={years}]"] = _measure(
+            lambda: render(bars[-1], *series[0]), setup=fresh, repeat=3)
+        widget = bars[-1]
+        results[f"BarChartWidget.update_chart[years={years}]"] = _measure(
+            lambda: render(widget, *series[next(steps) % len(series)]), number=20)
+        for widget in bars:
+            widget.close()
+            widget.deleteLater()
+    pie = PieChartWidget()
+    pie.resize(300, 300)
+    pie.show()
+    app.processEvents()
+    budgets = [{"Needs": 1500.0 + i * 10, "Wants": 500.0, "Savings": 300.0 + (i % 3) * 50} for i in range(8)]
+    steps = iter(range(10 ** 9))
+    results["PieChartWidget.update_chart"] = _measure(
+        lambda: render(pie, budgets[next(steps) % len(budgets)]), number=20)
+    pie.close()
+    pie.deleteLater()
+    app.processEvents()
+    return results
+
+
+BENCHMARKS = {
+    "calculator": bench_calculator,
+    "persistence": bench_persistence,
+    "auth": bench_auth,
+    "charts": bench_charts,
+}
+
+
+def run(groups=GROUPS, quick=False):
+    """Run the selected benchmark groups and return the results document."""
+    import numpy as np
+    document = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": quick,
+        },
+        "results": {},
+    }
+    for group in groups:
+        print(f"running {group} benchmarks...", file=sys.stderr, flush=True)
+        for name, timing in BENCHMARKS[group](quick).items():
+            document["results"][f"{group}.{name}"] = timing
+    return document
+
+
+def compare(baseline, current, threshold=0.25):
+    """
+    Compare two results documents by median time per call.
+    Returns (rows, regressions) where each row is (name, baseline seconds, current seconds, ratio)
+    and regressions lists the names that got slower by more than threshold.
+    """
+    rows = []
+    regressions = []
+    for name, timing in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = timing["median"] / before["median"] if before["median"] else float("inf")
+        rows.append((name, before["median"], timing["median"], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks and emit JSON results.")
+    run_parser.add_argument("--quick", action="store_true", help="Smaller sizes, for a fast smoke run.")
+    run_parser.add_argument("--only", default=",".join(GROUPS),
+                            help=f"Comma-separated groups to run (default: {','.join(GROUPS)}).")
+    run_parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a stored baseline.")
+    compare_parser.add_argument("baseline", help="Baseline results JSON.")
+    compare_parser.add_argument("current", help="Current results JSON.")
+    compare_parser.add_argument("--threshold", type=float, default=0.25,
+                                help="Allowed slowdown as a fraction of the baseline median (default: 0.25).")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        groups = [group.strip() for group in args.only.split(",") if group.strip()]
+        unknown = set(groups) - set(GROUPS)
+        if unknown:
+            parser.error(f"unknown benchmark groups: {', '.join(sorted(unknown))}")
+        document = run(groups, args.quick)
+        text = json.dumps(document, indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows, regressions = compare(baseline, current, args.threshold)
+    width = max((len(name) for name, *_ in rows), default=0)
+    for name, before, after, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<{width}}  {_format_seconds(before):>10}  {_format_seconds(after):>10}  {ratio:6.2f}x{flag}")
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%} in {len(rows)} benchmark(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
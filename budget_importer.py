@@ -0,0 +1,203 @@
+import csv
+import re
+import sys
+import time
+from itertools import islice
+from budget_manager import BudgetModel
+
+# Rule table: (regular expression, category). The first pattern that matches a transaction's
+# description decides its category; unmatched expenses fall back to DEFAULT_CATEGORY.
+DEFAULT_RULES = (
+    (r"rent|mortgage|landlord|property mgmt", "Needs"),
+    (r"electric|water|gas co|utility|utilities|internet|comcast|verizon|at&t|t-mobile", "Needs"),
+    (r"grocery|safeway|kroger|whole foods|trader joe|aldi|costco|walmart", "Needs"),
+    (r"insurance|geico|state farm|pharmacy|cvs|walgreens|doctor|medical|dental", "Needs"),
+    (r"shell|chevron|exxon|fuel|transit|metro|parking", "Needs"),
+    (r"401k|ira|vanguard|fidelity|schwab|brokerage|savings|invest", "Savings"),
+    (r"restaurant|cafe|coffee|starbucks|bar |doordash|uber eats|grubhub", "Wants"),
+    (r"netflix|spotify|hulu|disney|amazon|steam|cinema|theater|travel|airline|hotel", "Wants"),
+)
+DEFAULT_CATEGORY = "Wants"
+
+DESCRIPTION_COLUMNS = ("description", "name", "payee", "memo", "merchant")
+AMOUNT_COLUMNS = ("amount", "transaction amount", "trnamt")
+
+
+def compile_rules(rules=DEFAULT_RULES):
+    return [(re.compile(pattern, re.IGNORECASE), category) for pattern, category in rules]
+
+
+def normalize_name(description):
+    # Drop reference numbers, card suffixes and punctuation so "SAFEWAY #1234 04/02" and
+    # "SAFEWAY #88" land on the same budget item.
+    words = re.sub(r"[^A-Za-z&' ]+", " ", description).split()
+    return " ".join(words[:3]).title() or "Other"
+
+
+def _parse_amount(text):
+    text = text.strip().replace(",", "").replace("$", "")
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return float(text)
+
+
+def read_csv(path):
+    """
+    Yield (description, amount) for each row of a bank CSV export, one row at a time.
+    Negative amounts are spending and positive ones income; files with separate debit and
+    credit columns are supported too.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or ()}
+        description_col = next((columns[c] for c in DESCRIPTION_COLUMNS if c in columns), None)
+        amount_col = next((columns[c] for c in AMOUNT_COLUMNS if c in columns), None)
+        debit_col, credit_col = columns.get("debit"), columns.get("credit")
+        if description_col is None or (amount_col is None and debit_col is None):
+            raise ValueError(f"Unrecognized CSV columns: {reader.fieldnames}")
+        for row in reader:
+            try:
+                if amount_col is not None:
+                    amount = _parse_amount(row[amount_col])
+                else:
+                    debit = row[debit_col] or "0"
+                    credit = (row[credit_col] if credit_col else "") or "0"
+                    amount = _parse_amount(credit) - abs(_parse_amount(debit))
+            except (ValueError, TypeError):
+                yield None
+                continue
+            yield row[description_col] or "", amount
+
+
+def _ofx_tokens(f, block_size=1 << 16):
+    # OFX is SGML-like and may be one huge line, so split the stream on "<" block by block.
+    remainder = ""
+    while True:
+        block = f.read(block_size)
+        if not block:
+            break
+        parts = (remainder + block).split("<")
+        remainder = parts.pop()
+        for part in parts:
+            if part:
+                yield part
+    if remainder:
+        yield remainder
+
+
+def read_ofx(path):
+    """Yield (description, amount) for each <STMTTRN> in an OFX/QFX statement, streaming."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        transaction = None
+        for token in _ofx_tokens(f):
+            tag, _, value = token.partition(">")
+            tag = tag.strip().upper()
+            if tag == "STMTTRN":
+                transaction = {}
+            elif tag == "/STMTTRN" and transaction is not None:
+                try:
+                    amount = _parse_amount(transaction.get("TRNAMT", ""))
+                except ValueError:
+                    yield None
+                else:
+                    yield transaction.get("NAME") or transaction.get("MEMO") or "", amount
+                transaction = None
+            elif transaction is not None and not tag.startswith("/"):
+                transaction[tag] = value.strip()
+
+
+def read_transactions(path):
+    if path.lower().endswith((".ofx", ".qfx")):
+        return read_ofx(path)
+    return read_csv(path)
+
+
+def categorize(transactions, rules=None, months=1):
+    """
+    Turn (description, amount) pairs into budget items (kind, category, name, amount).
+    Amounts are divided by `months` so a multi-month statement becomes a monthly budget.
+    Unparseable rows (None) are passed through for counting.
+    """
+    compiled = compile_rules(rules or DEFAULT_RULES)
+    for transaction in transactions:
+        if transaction is None:
+            yield None
+            continue
+        description, amount = transaction
+        name = normalize_name(description)
+        if amount >= 0:
+            yield "income", "", name, amount / months
+            continue
+        category = next((cat for pattern, cat in compiled if pattern.search(description)), DEFAULT_CATEGORY)
+        yield "expense", category, name, -amount / months
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_statement(dm, user_id, path, rules=None, months=1, chunk_size=5000, progress=None, replace=False):
+    """
+    Stream a CSV or OFX statement into user_id's budget.
+    Rows are categorized with the rule table, summed per item within each chunk of chunk_size
+    rows and written to budget_items in one transaction per chunk, so memory stays flat however
+    large the file is. progress, if given, is called with the rows read so far after every chunk.
+
+    By default the statement's amounts are added to the user's existing items, including ones
+    entered by hand, so importing the same statement twice (or two overlapping statements)
+    counts those transactions twice. With replace=True, each item the statement contains is
+    set to the statement's total instead, so re-importing a statement leaves the budget as it
+    was; items the statement does not mention are kept.
+    Returns (BudgetModel with the user's resulting budget, stats dict including rows_per_second).
+    """
+    start = time.perf_counter()
+    rows = skipped = 0
+    # Items already written by this import; later chunks add to them even in replace mode.
+    written = set()
+    for chunk in _chunks(categorize(read_transactions(path), rules, months), chunk_size):
+        items = {}
+        for item in chunk:
+            if item is None:
+                skipped += 1
+                continue
+            kind, category, name, amount = item
+            items[(kind, category, name)] = items.get((kind, category, name), 0) + amount
+        dm.add_budget_items(user_id, items, replace=items.keys() - written if replace else ())
+        written.update(items)
+        rows += len(chunk)
+        if progress:
+            progress(rows)
+
+    budget = BudgetModel()
+    budget.load(*dm.get_budget_items(user_id))
+    dm.upsert_budget_summary(user_id, budget.incomes, budget.expenses, budget.totals())
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": rows,
+        "skipped": skipped,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else rows
+    }
+    return budget, stats
+
+if __name__ == "__main__":
+    from data_manager import DataManager
+    args = sys.argv[1:]
+    replace = "--replace" in args
+    if replace:
+        args.remove("--replace")
+    if len(args) not in (2, 3):
+        print("Usage: python budget_importer.py [--replace] <statement.csv|.ofx> <user_id> [months]")
+        exit(1)
+    statement_path, user_id = args[0], int(args[1])
+    months = int(args[2]) if len(args) == 3 else 1
+    budget, stats = import_statement(DataManager(), user_id, statement_path, months=months, replace=replace,
+                                     progress=lambda n: print(f"\r{n} rows", end="", flush=True))
+    print(f"\nImported {stats['rows']} rows ({stats['skipped']} skipped) in {stats['seconds']}s "
+          f"({stats['rows_per_second']} rows/s)")
+    budget.show_summary()
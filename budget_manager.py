@@ -60,6 +60,91 @@ class BudgetManager:
         print(f"Total Expenses: ${total_expenses:.2f}")
         print(f"Remaining Balance: ${remaining_balance:.2f}")
 
+
+class BudgetModel(BudgetManager):
+    """
+    BudgetManager that keeps running income, per-category and overall expense totals, updated
+    in O(1) on every add, edit or delete instead of being re-summed.
+    Listeners added with add_listener are called once with the model after each change.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.listeners = []
+        self.total_income = 0.0
+        self.category_totals = {cat: 0.0 for cat in self.expenses}
+        self.total_expenses = 0.0
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def notify(self):
+        for callback in self.listeners:
+            callback(self)
+
+    def load(self, incomes, expenses):
+        """Replace the whole budget, e.g. with saved data, and notify listeners once."""
+        self.incomes = dict(incomes)
+        self.expenses = {cat: {} for cat in ("Needs", "Wants", "Savings")}
+        for cat, items in expenses.items():
+            self.expenses[cat] = dict(items)
+        self.total_income = float(sum(self.incomes.values()))
+        self.category_totals = {cat: float(sum(items.values())) for cat, items in self.expenses.items()}
+        self.total_expenses = sum(self.category_totals.values())
+        self.notify()
+
+    def add_income(self, name, amount):
+        self.total_income += amount - self.incomes.get(name, 0)
+        self.incomes[name] = amount
+        self.notify()
+
+    def delete_income(self, name):
+        if name not in self.incomes:
+            super().delete_income(name)
+            return
+        self.total_income -= self.incomes.pop(name)
+        if not self.incomes:
+            # Reset instead of trusting the running sum so float drift can't leave a stray balance.
+            self.total_income = 0.0
+        self.notify()
+
+    def add_expense(self, category, name, amount):
+        category = category.capitalize()
+        if category not in self.expenses:
+            super().add_expense(category, name, amount)
+            return
+        items = self.expenses[category]
+        delta = amount - items.get(name, 0)
+        items[name] = amount
+        self.category_totals[category] += delta
+        self.total_expenses += delta
+        self.notify()
+
+    def delete_expense(self, category, name):
+        category = category.capitalize()
+        if category not in self.expenses or name not in self.expenses[category]:
+            super().delete_expense(category, name)
+            return
+        amount = self.expenses[category].pop(name)
+        self.category_totals[category] -= amount
+        self.total_expenses -= amount
+        if not self.expenses[category]:
+            self.category_totals[category] = 0.0
+            self.total_expenses = sum(self.category_totals.values())
+        self.notify()
+
+    def calculate_totals(self):
+        remaining_balance = self.total_income - self.total_expenses
+        return self.total_income, dict(self.category_totals), self.total_expenses, remaining_balance
+
+    def totals(self):
+        """Totals in the shape DataManager.upsert_budget_summary expects."""
+        return {
+            "total_income": self.total_income,
+            "total_expenses": self.total_expenses,
+            "remaining_balance": self.total_income - self.total_expenses
+        }
+
 if __name__ == '__main__':
     from PyQt5.QtWidgets import QApplication
     import sys
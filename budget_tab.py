@@ -0,0 +1,163 @@
+import datetime
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QInputDialog, QMessageBox
+from PyQt5.QtCore import pyqtSlot
+from budget_manager import BudgetModel
+from charts import PieChartWidget
+from instrumentation import timed
+
+
+# --- Budget Summary Tab Widget ---
+class BudgetTabWidget(QWidget):
+    def __init__(self, dm, user_id, parent=None):
+        super().__init__(parent)
+        self.dm = dm
+        self.user_id = user_id
+        # The model owns the incomes/expenses and their running totals; every edit calls
+        # onBudgetChanged once.
+        self.budget = BudgetModel()
+        self.budget.add_listener(self.onBudgetChanged)
+        self.initUI()
+        self.loadData()
+
+    def initUI(self):
+        self.layout = QVBoxLayout()
+        self.lastSavedLabel = QLabel("Budget Saved: N/A")
+        self.incomeLabel = QLabel("Incomes:")
+        self.incomeList = QLabel("")
+        self.addIncomeButton = QPushButton("Add Income")
+        self.removeIncomeButton = QPushButton("Remove Income")
+        self.expenseLabel = QLabel("Expenses:")
+        self.expenseList = QLabel("")
+        self.addExpenseButton = QPushButton("Add Expense")
+        self.removeExpenseButton = QPushButton("Remove Expense")
+        self.saveBudgetButton = QPushButton("Save Budget Summary")
+        self.messageLabel = QLabel("")
+        self.savingsLabel = QLabel("")
+        self.pieChart = PieChartWidget()
+        self.layout.addWidget(self.lastSavedLabel)
+        self.layout.addWidget(self.incomeLabel)
+        self.layout.addWidget(self.incomeList)
+        self.layout.addWidget(self.addIncomeButton)
+        self.layout.addWidget(self.removeIncomeButton)
+        self.layout.addWidget(self.expenseLabel)
+        self.layout.addWidget(self.expenseList)
+        self.layout.addWidget(self.addExpenseButton)
+        self.layout.addWidget(self.removeExpenseButton)
+        self.layout.addWidget(self.saveBudgetButton)
+        self.layout.addWidget(self.messageLabel)
+        self.layout.addWidget(self.savingsLabel)
+        self.layout.addWidget(self.pieChart)
+        self.setLayout(self.layout)
+        self.addIncomeButton.clicked.connect(self.addIncome)
+        self.removeIncomeButton.clicked.connect(self.removeIncome)
+        self.addExpenseButton.clicked.connect(self.addExpense)
+        self.removeExpenseButton.clicked.connect(self.removeExpense)
+        self.saveBudgetButton.clicked.connect(self.saveBudget)
+
+    def setUser(self, user_id):
+        self.clear()
+        self.user_id = user_id
+        self.loadData()
+
+    def clear(self):
+        self.lastSavedLabel.setText("Budget Saved: N/A")
+        self.messageLabel.setText("")
+        self.budget.load({}, {})
+
+    def loadData(self):
+        data = self.dm.get_budget_summary(self.user_id)
+        if data:
+            self.lastSavedLabel.setText(f"Budget Saved: {data.name}")
+            incomes, expenses = self.dm.get_budget_items(self.user_id)
+            self.budget.load(incomes, expenses)
+
+    def addIncome(self):
+        iname, ok = QInputDialog.getText(self, "Add Income", "Enter income name:")
+        if not ok or not iname:
+            return
+        iamount, ok = QInputDialog.getDouble(self, "Add Income", "Enter income amount:")
+        if not ok:
+            return
+        self.budget.add_income(iname, iamount)
+
+    def removeIncome(self):
+        if not self.budget.incomes:
+            QMessageBox.information(self, "Remove Income", "No incomes to remove.")
+            return
+        income_names = list(self.budget.incomes.keys())
+        item, ok = QInputDialog.getItem(self, "Remove Income", "Select income to remove:", income_names, 0, False)
+        if ok and item:
+            self.budget.delete_income(item)
+
+    def onBudgetChanged(self, budget):
+        self.updateIncomeList()
+        self.updateExpenseList()
+        self.updateSavingsLabel()
+        self.updatePieChart()
+
+    def updateIncomeList(self):
+        text = ""
+        for key, value in self.budget.incomes.items():
+            text += f"{key}: ${value:.2f}\n"
+        self.incomeList.setText(text)
+
+    def addExpense(self):
+        categories = ["Needs", "Wants", "Savings"]
+        cat, ok = QInputDialog.getItem(self, "Add Expense", "Select category:", categories, 0, False)
+        if not ok:
+            return
+        ename, ok = QInputDialog.getText(self, "Add Expense", f"Enter {cat} expense name:")
+        if not ok or not ename:
+            return
+        eamount, ok = QInputDialog.getDouble(self, "Add Expense", "Enter expense amount:")
+        if not ok:
+            return
+        self.budget.add_expense(cat, ename, eamount)
+
+    def removeExpense(self):
+        available_categories = [cat for cat, items in self.budget.expenses.items() if items]
+        if not available_categories:
+            QMessageBox.information(self, "Remove Expense", "No expenses to remove.")
+            return
+        cat, ok = QInputDialog.getItem(self, "Remove Expense", "Select expense category:", available_categories, 0,
+                                       False)
+        if not ok or not cat:
+            return
+        expense_names = list(self.budget.expenses[cat].keys())
+        item, ok = QInputDialog.getItem(self, "Remove Expense", f"Select {cat} expense to remove:", expense_names, 0,
+                                        False)
+        if ok and item:
+            self.budget.delete_expense(cat, item)
+
+    def updateExpenseList(self):
+        text = ""
+        total_income = self.budget.total_income
+        for cat, items in self.budget.expenses.items():
+            text += f"{cat}:\n"
+            for key, value in items.items():
+                text += f"  {key}: ${value:.2f}\n"
+            total = self.budget.category_totals[cat]
+            percentage = (total / total_income * 100) if total_income else 0
+            text += f"  Total {cat}: ${total:.2f} ({percentage:.2f}% of total income)\n"
+        self.expenseList.setText(text)
+
+    def updateSavingsLabel(self):
+        total_income, _, total_expenses, remaining = self.budget.calculate_totals()
+        if total_income == 0:
+            self.savingsLabel.setText("")
+        else:
+            if remaining >= 0:
+                self.savingsLabel.setText(f"Money left for savings: ${remaining:.2f}")
+            else:
+                self.savingsLabel.setText(f"Overspending by: ${abs(remaining):.2f} per month")
+
+    def updatePieChart(self):
+        self.pieChart.update_chart(self.budget.category_totals)
+
+    @pyqtSlot()
+    @timed("BudgetTab.saveBudget")
+    def saveBudget(self):
+        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.dm.upsert_budget_summary(self.user_id, self.budget.incomes, self.budget.expenses, self.budget.totals())
+        self.messageLabel.setText("Budget summary saved.")
+        self.lastSavedLabel.setText(f"Budget Saved: {current_time}")
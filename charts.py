@@ -0,0 +1,249 @@
+import math
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from instrumentation import timed
+
+
+def _nice_ceiling(value):
+    # Round an axis limit up to 1, 2 or 5 times a power of ten, so small changes in the data
+    # usually keep the same limits and can be redrawn by blitting.
+    if value <= 0:
+        return 1.0
+    magnitude = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+# --- Canvas that redraws only its data artists when it can ---
+class BlitCanvas(FigureCanvas):
+    """
+    FigureCanvas whose data artists are created once, marked animated and updated in place.
+    A full draw (scheduled with draw_idle) renders the static parts (axes, ticks, labels) and
+    caches them as a background; refresh() then only restores that background and redraws
+    the animated artists, unless the static parts changed too.
+    """
+
+    def __init__(self, figure, parent=None):
+        super().__init__(figure)
+        self.setParent(parent)
+        self.background = None
+        self.mpl_connect("draw_event", self.onDraw)
+
+    def animatedArtists(self):
+        return []
+
+    def onDraw(self, event):
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        for artist in self.animatedArtists():
+            self.figure.draw_artist(artist)
+
+    def refresh(self, full=False):
+        if full or self.background is None:
+            # draw_idle coalesces any number of requests into one draw on the next event loop pass.
+            self.draw_idle()
+            return
+        self.restore_region(self.background)
+        for artist in self.animatedArtists():
+            self.figure.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+
+def _minmax_decimate(values, max_points):
+    # Reduce a long series to about max_points points by keeping each bucket's minimum and
+    # maximum, so peaks and dips survive however many years are plotted.
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n, dtype=float), values
+    edges = np.linspace(0, n, max_points // 2 + 1).astype(int)
+    starts = edges[:-1]
+    centers = (starts + edges[1:] - 1) / 2
+    lows = np.fmin.reduceat(values, starts)
+    highs = np.fmax.reduceat(values, starts)
+    return np.repeat(centers, 2), np.column_stack([lows, highs]).ravel()
+
+
+# --- Bar Chart Widget for Retirement Calculation ---
+class BarChartWidget(BlitCanvas):
+    """
+    Yearly balance chart. With mode "auto" the layout follows the number of years so the
+    artist count stays bounded: one bar pair per year up to maxBars years, one bar pair per
+    bucketYears-year bucket up to maxBars buckets, and two lines decimated to at most
+    maxPoints points beyond that. mode can also be forced to "bars", "buckets" or "line".
+    """
+    barWidth = 0.35
+    maxBars = 40
+    bucketYears = 5
+    maxPoints = 500
+
+    def __init__(self, parent=None, mode="auto"):
+        self.figure = Figure(figsize=(5, 3))
+        self.axes = self.figure.add_subplot(111)
+        super().__init__(self.figure, parent)
+        self.axes.set_xlabel("Year")
+        self.axes.set_ylabel("Balance (in millions of $)")
+        self.axes.set_title("Yearly Balance")
+        self.mode = mode
+        self.layout = None
+        self.withBars = []
+        self.withoutBars = []
+        self.containers = []
+        self.lines = []
+
+    def animatedArtists(self):
+        return self.withBars + self.withoutBars + self.lines
+
+    def chooseMode(self, n):
+        if self.mode != "auto":
+            return self.mode
+        if n <= self.maxBars:
+            return "bars"
+        if n <= self.maxBars * self.bucketYears:
+            return "buckets"
+        return "line"
+
+    def clearArtists(self):
+        for artist in self.containers + self.lines:
+            artist.remove()
+        self.containers, self.lines = [], []
+        self.withBars, self.withoutBars = [], []
+
+    def rebuildBars(self, count):
+        # Bars are pooled: a chart with fewer bars hides the spare ones, so changing the number
+        # of years only moves existing rectangles instead of creating new ones.
+        self.clearArtists()
+        x = np.arange(count)
+        zeros = np.zeros(count)
+        with_container = self.axes.bar(x, zeros, self.barWidth, label="With Contribution",
+                                       color='blue', animated=True)
+        without_container = self.axes.bar(x, zeros, self.barWidth, label="Without Contribution",
+                                          color='orange', animated=True)
+        self.containers = [with_container, without_container]
+        self.withBars = list(with_container.patches)
+        self.withoutBars = list(without_container.patches)
+        self.axes.legend()
+
+    def placeBars(self, x, width):
+        if len(x) > len(self.withBars):
+            self.rebuildBars(max(len(x), self.maxBars))
+        positions = x.tolist()
+        for bars, offset in ((self.withBars, -width), (self.withoutBars, 0)):
+            for i, bar in enumerate(bars):
+                if i < len(positions):
+                    bar.set_x(positions[i] + offset)
+                    bar.set_width(width)
+                    bar.set_visible(True)
+                else:
+                    bar.set_visible(False)
+
+    def rebuildLines(self):
+        self.clearArtists()
+        with_line, = self.axes.plot([], [], color='blue', label="With Contribution", animated=True)
+        without_line, = self.axes.plot([], [], color='orange', label="Without Contribution", animated=True)
+        self.lines = [with_line, without_line]
+        self.axes.legend()
+
+    @timed("BarChartWidget.update_chart")
+    def update_chart(self, yearly_with, yearly_without):
+        # Accepts lists or NumPy arrays; values are converted to millions in one vectorized step.
+        yearly_with_m = np.asarray(yearly_with, dtype=float) / 1e6
+        yearly_without_m = np.asarray(yearly_without, dtype=float) / 1e6
+        n = len(yearly_with_m)
+        mode = self.chooseMode(n)
+        full = (mode, n) != self.layout
+        if mode == "line":
+            if full:
+                self.rebuildLines()
+            for line, values in zip(self.lines, (yearly_with_m, yearly_without_m)):
+                line.set_data(*_minmax_decimate(values, self.maxPoints))
+        else:
+            if mode == "buckets":
+                # Balances are running totals, so a bucket shows the balance at its last year.
+                x = np.arange(n - 1, -1, -self.bucketYears)[::-1]
+                width = self.barWidth * self.bucketYears
+            else:
+                x = np.arange(n)
+                width = self.barWidth
+            if full:
+                self.placeBars(x, width)
+            for bar, height in zip(self.withBars, yearly_with_m[x].tolist()):
+                bar.set_height(height)
+            for bar, height in zip(self.withoutBars, yearly_without_m[x].tolist()):
+                bar.set_height(height)
+        if full:
+            self.layout = (mode, n)
+            pad = self.barWidth * (self.bucketYears if mode == "buckets" else 1)
+            self.axes.set_xlim(-0.5 - pad, n - 0.5 + pad)
+        values = np.concatenate([yearly_with_m, yearly_without_m])
+        values = values[np.isfinite(values)]
+        top = _nice_ceiling(values.max()) if values.size and values.max() > 0 else 1.0
+        bottom = -_nice_ceiling(-values.min()) if values.size and values.min() < 0 else 0.0
+        if (bottom, top) != tuple(self.axes.get_ylim()):
+            self.axes.set_ylim(bottom, top)
+            full = True
+        self.refresh(full)
+
+
+# --- Pie Chart Widget for Budget Summary ---
+class PieChartWidget(BlitCanvas):
+    startangle = 140
+
+    def __init__(self, parent=None):
+        self.figure = Figure(figsize=(3, 3))
+        self.axes = self.figure.add_subplot(111)
+        super().__init__(self.figure, parent)
+        self.labels = None
+        self.wedges = []
+        self.labelTexts = []
+        self.pctTexts = []
+        self.emptyText = self.axes.text(0.5, 0.5, "No Expenses", horizontalalignment='center',
+                                        verticalalignment='center', transform=self.axes.transAxes,
+                                        animated=True)
+
+    def animatedArtists(self):
+        return self.wedges + self.labelTexts + self.pctTexts + [self.emptyText]
+
+    def rebuildPie(self, labels):
+        # Only needed when the set of categories changes; otherwise wedges are updated in place.
+        for artist in self.wedges + self.labelTexts + self.pctTexts:
+            artist.remove()
+        self.labels = labels
+        self.wedges, self.labelTexts, self.pctTexts = self.axes.pie(
+            [1] * len(labels), labels=labels, autopct='%1.1f%%', startangle=self.startangle)
+        for artist in self.wedges + self.labelTexts + self.pctTexts:
+            artist.set_animated(True)
+
+    @timed("PieChartWidget.update_chart")
+    def update_chart(self, category_totals):
+        labels = list(category_totals.keys())
+        sizes = np.asarray(list(category_totals.values()), dtype=float)
+        full = labels != self.labels
+        if full:
+            self.rebuildPie(labels)
+        total = sizes.sum()
+        self.emptyText.set_visible(total == 0)
+        if total == 0:
+            for artist in self.wedges + self.labelTexts + self.pctTexts:
+                artist.set_visible(False)
+            self.refresh(full)
+            return
+        fractions = sizes / total
+        ends = self.startangle + 360 * np.cumsum(fractions)
+        starts = ends - 360 * fractions
+        for wedge, label, pct, theta1, theta2, fraction in zip(
+                self.wedges, self.labelTexts, self.pctTexts, starts.tolist(), ends.tolist(), fractions.tolist()):
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            middle = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text('%1.1f%%' % (fraction * 100))
+            visible = fraction > 0
+            wedge.set_visible(visible)
+            label.set_visible(visible)
+            pct.set_visible(visible)
+        self.refresh(full)
@@ -1,11 +1,274 @@
-import sqlite3
 import json
 import datetime
+import threading
+import time
+import atexit
+from database import get_provider
+from instrumentation import timed_methods
+from records import RetirementRecord, BudgetRecord
 
+# Write statements are module constants so every call reuses the same text and therefore the
+# same prepared statement from the connection's statement cache (see database.STATEMENT_CACHE_SIZE).
+RETIREMENT_UPSERT = '''
+    INSERT INTO retirement_results (
+        user_id, name, starting_amount, annual_rate, years, yearly_contribution,
+        balance_with_contrib, balance_no_contrib,
+        annual_withdraw_with_contrib, annual_withdraw_no_contrib,
+        monthly_withdraw_with_contrib, monthly_withdraw_no_contrib, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        name = excluded.name, starting_amount = excluded.starting_amount,
+        annual_rate = excluded.annual_rate, years = excluded.years,
+        yearly_contribution = excluded.yearly_contribution,
+        balance_with_contrib = excluded.balance_with_contrib,
+        balance_no_contrib = excluded.balance_no_contrib,
+        annual_withdraw_with_contrib = excluded.annual_withdraw_with_contrib,
+        annual_withdraw_no_contrib = excluded.annual_withdraw_no_contrib,
+        monthly_withdraw_with_contrib = excluded.monthly_withdraw_with_contrib,
+        monthly_withdraw_no_contrib = excluded.monthly_withdraw_no_contrib,
+        created_at = excluded.created_at
+'''
+
+BUDGET_UPSERT = '''
+    INSERT INTO budget_summary (
+        user_id, name, incomes, expenses, total_income, total_expenses, remaining_balance, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        name = excluded.name, incomes = excluded.incomes, expenses = excluded.expenses,
+        total_income = excluded.total_income, total_expenses = excluded.total_expenses,
+        remaining_balance = excluded.remaining_balance, created_at = excluded.created_at
+'''
+
+RETIREMENT_HISTORY_INSERT = '''
+    INSERT INTO retirement_history (
+        user_id, name, starting_amount, annual_rate, years, yearly_contribution,
+        balance_with_contrib, balance_no_contrib,
+        annual_withdraw_with_contrib, annual_withdraw_no_contrib,
+        monthly_withdraw_with_contrib, monthly_withdraw_no_contrib, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+BUDGET_HISTORY_INSERT = '''
+    INSERT INTO budget_history (
+        user_id, name, incomes, expenses, total_income, total_expenses, remaining_balance, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Reads name their columns in record order, so rows map onto the record classes directly.
+RETIREMENT_SELECT = f"SELECT {', '.join(RetirementRecord.__slots__)} FROM retirement_results WHERE user_id = ?"
+BUDGET_SELECT = f"SELECT {', '.join(BudgetRecord.__slots__)} FROM budget_summary WHERE user_id = ?"
+
+# Recomputed results only replace the derived columns; the save name, timestamp and history
+# stay those of the user's own save.
+RETIREMENT_RESULT_UPDATE = '''
+    UPDATE retirement_results SET
+        balance_with_contrib = ?, balance_no_contrib = ?,
+        annual_withdraw_with_contrib = ?, annual_withdraw_no_contrib = ?,
+        monthly_withdraw_with_contrib = ?, monthly_withdraw_no_contrib = ?
+    WHERE user_id = ?
+'''
+
+BUDGET_TOTALS_UPDATE = '''
+    UPDATE budget_summary SET total_income = ?, total_expenses = ?, remaining_balance = ? WHERE user_id = ?
+'''
+
+BUDGET_ITEM_UPSERT = '''
+    INSERT INTO budget_items (user_id, kind, category, name, amount) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, kind, category, name) DO UPDATE SET amount = excluded.amount
+'''
+
+BUDGET_ITEM_ADD = '''
+    INSERT INTO budget_items (user_id, kind, category, name, amount) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, kind, category, name) DO UPDATE SET amount = amount + excluded.amount
+'''
+
+BUDGET_ITEM_DELETE = "DELETE FROM budget_items WHERE user_id = ? AND kind = ? AND category = ? AND name = ?"
+
+EXPENSE_CATEGORIES = ("Needs", "Wants", "Savings")
+
+def _budget_item_amounts(incomes, expenses):
+    # Flatten the incomes/expenses dicts into {(kind, category, name): amount}. Incomes have no
+    # category and are stored with an empty one.
+    items = {("income", "", name): amount for name, amount in incomes.items()}
+    for category, category_items in expenses.items():
+        for name, amount in category_items.items():
+            items[("expense", category, name)] = amount
+    return items
+
+def _sync_budget_items(conn, rows):
+    """
+    Bring budget_items in line with budget rows (as built by DataManager._budget_row), writing
+    only the items that were added, changed or removed since the user's last save.
+    """
+    for row in rows:
+        user_id = row[0]
+        wanted = _budget_item_amounts(json.loads(row[2]), json.loads(row[3]))
+        existing = {
+            (kind, category, name): amount
+            for kind, category, name, amount in conn.execute(
+                "SELECT kind, category, name, amount FROM budget_items WHERE user_id = ?", (user_id,))
+        }
+        changed = [(user_id, *key, amount) for key, amount in wanted.items() if existing.get(key) != amount]
+        removed = [(user_id, *key) for key in existing if key not in wanted]
+        if changed:
+            conn.executemany(BUDGET_ITEM_UPSERT, changed)
+        if removed:
+            conn.executemany(BUDGET_ITEM_DELETE, removed)
+
+def _run_writes(conn, writes, rows):
+    # A write is either an SQL statement run once per row or a callable taking (conn, rows).
+    for write in writes:
+        if callable(write):
+            write(conn, rows)
+        else:
+            conn.executemany(write, rows)
+
+# Every save updates the user's latest row and appends to the history table with the same
+# parameters, in one transaction. Budget saves also sync the normalized budget_items.
+RETIREMENT_WRITES = (RETIREMENT_UPSERT, RETIREMENT_HISTORY_INSERT)
+BUDGET_WRITES = (BUDGET_UPSERT, BUDGET_HISTORY_INSERT, _sync_budget_items)
+# Append-only writes: the write-behind queue runs these for every save, never coalesced.
+HISTORY_WRITES = frozenset((RETIREMENT_HISTORY_INSERT, BUDGET_HISTORY_INSERT))
+
+# PRAGMA user_version of a fully migrated database; see DataManager.migrate.
+SCHEMA_VERSION = 2
+
+def _timestamps():
+    # The "name" column holds a readable save timestamp; created_at holds the ISO form.
+    now = datetime.datetime.now()
+    return now.strftime("%Y-%m-%d %H:%M:%S"), now.isoformat()
+
+class WriteBehindQueue:
+    """
+    Buffers upserts in memory and commits them in batches from a dedicated writer thread.
+    Each save is a row plus the tuple of statements to run it through (e.g. RETIREMENT_WRITES).
+    The latest-row writes are coalesced per (statements, user_id) so only the newest save runs
+    them, while HISTORY_WRITES run for every save, in order, in the same commit.
+    A batch is committed once batch_size saves are pending or flush_interval seconds have passed,
+    and put() blocks while max_pending saves are already waiting.
+    """
+
+    def __init__(self, provider, batch_size=100, flush_interval=0.5, max_pending=10000):
+        self.provider = provider
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pending = {}
+        self.history = []
+        self.cond = threading.Condition()
+        self.enqueued = 0
+        self.committed = 0
+        self.flush_requested = False
+        self.closed = False
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="DataManagerWriter", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def put(self, statements, user_id, row):
+        with self.cond:
+            if self.closed:
+                raise RuntimeError("Write-behind queue is closed.")
+            while len(self.history) >= self.max_pending:
+                self.cond.wait()
+            self.pending[(statements, user_id)] = row
+            self.history.append((statements, row))
+            self.enqueued += 1
+            if len(self.history) >= self.batch_size:
+                self.cond.notify_all()
+
+    def is_pending(self, statements, user_id):
+        with self.cond:
+            return (statements, user_id) in self.pending
+
+    def flush(self):
+        """
+        Block until every save queued before this call has been committed.
+        Re-raises the error if the writer failed to commit a batch.
+        """
+        with self.cond:
+            target = self.enqueued
+            self.flush_requested = True
+            self.cond.notify_all()
+            while self.committed < target:
+                self.cond.wait()
+            if self.error is not None:
+                error, self.error = self.error, None
+                raise error
+
+    def close(self):
+        """Drain the queue and stop the writer thread."""
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        conn = self.provider.connection()
+        closing = False
+        while not closing:
+            with self.cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not (self.closed or self.flush_requested or len(self.history) >= self.batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                batch, self.pending = self.pending, {}
+                history, self.history = self.history, []
+                target = self.enqueued
+                self.flush_requested = False
+                closing = self.closed
+                # Wake any producer waiting for room in the queue.
+                self.cond.notify_all()
+            error = None
+            if batch:
+                latest_rows = {}
+                for (statements, _), row in batch.items():
+                    latest_rows.setdefault(statements, []).append(row)
+                history_rows = {}
+                for statements, row in history:
+                    history_rows.setdefault(statements, []).append(row)
+                try:
+                    with conn:
+                        for statements, rows in latest_rows.items():
+                            _run_writes(conn, [w for w in statements if w not in HISTORY_WRITES], rows)
+                        for statements, rows in history_rows.items():
+                            _run_writes(conn, [w for w in statements if w in HISTORY_WRITES], rows)
+                except Exception as e:
+                    error = e
+                # Other managers may have cached the old rows while these saves were queued.
+                self.provider.cache.invalidate()
+            with self.cond:
+                if error is not None:
+                    self.error = error
+                self.committed = target
+                self.cond.notify_all()
+        self.provider.release()
+
+
+@timed_methods("DataManager")
 class DataManager:
-    def __init__(self, db_name="app_data.db"):
-        self.conn = sqlite3.connect(db_name)
+    def __init__(self, db_name="app_data.db", provider=None, write_behind=False, **write_behind_options):
+        """
+        With write_behind=True, upserts are queued and committed in batches by a WriteBehindQueue
+        (write_behind_options are passed to it). Call flush() when a save must be durable and
+        close() on shutdown to drain the queue.
+        """
+        self.provider = provider or get_provider(db_name)
         self.create_tables()
+        self.writer = WriteBehindQueue(self.provider, **write_behind_options) if write_behind else None
+        # Shared with every manager on the same provider, so saved results read once stay cached
+        # across dashboards until an upsert replaces them.
+        self.cache = self.provider.cache
+
+    @property
+    def conn(self):
+        # Each thread (GUI or worker) gets its own pooled connection from the provider.
+        return self.provider.connection()
 
     def create_tables(self):
         # In each table, the "name" field will hold the save timestamp.
@@ -43,116 +306,333 @@ class DataManager:
             )
         ''')
         self.conn.commit()
+        self.migrate()
+
+    def migrate(self):
+        """
+        Bring the schema up to SCHEMA_VERSION, tracked in PRAGMA user_version.
+        Version 1 adds the append-only retirement_history and budget_history tables and copies
+        the existing rows into them. Version 2 adds budget_items and fills it from the JSON
+        incomes/expenses of each budget_summary row.
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        # BEGIN IMMEDIATE takes the write lock up front so two processes can't migrate at once.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS retirement_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        starting_amount REAL,
+                        annual_rate REAL,
+                        years INTEGER,
+                        yearly_contribution REAL,
+                        balance_with_contrib REAL,
+                        balance_no_contrib REAL,
+                        annual_withdraw_with_contrib REAL,
+                        annual_withdraw_no_contrib REAL,
+                        monthly_withdraw_with_contrib REAL,
+                        monthly_withdraw_no_contrib REAL,
+                        created_at TEXT,
+                        FOREIGN KEY(user_id) REFERENCES users(id)
+                    )
+                ''')
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS budget_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        incomes TEXT,
+                        expenses TEXT,
+                        total_income REAL,
+                        total_expenses REAL,
+                        remaining_balance REAL,
+                        created_at TEXT,
+                        FOREIGN KEY(user_id) REFERENCES users(id)
+                    )
+                ''')
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_retirement_history_user_created "
+                    "ON retirement_history (user_id, created_at)")
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_budget_history_user_created "
+                    "ON budget_history (user_id, created_at)")
+                self.conn.execute('''
+                    INSERT INTO retirement_history (
+                        user_id, name, starting_amount, annual_rate, years, yearly_contribution,
+                        balance_with_contrib, balance_no_contrib,
+                        annual_withdraw_with_contrib, annual_withdraw_no_contrib,
+                        monthly_withdraw_with_contrib, monthly_withdraw_no_contrib, created_at
+                    )
+                    SELECT user_id, name, starting_amount, annual_rate, years, yearly_contribution,
+                        balance_with_contrib, balance_no_contrib,
+                        annual_withdraw_with_contrib, annual_withdraw_no_contrib,
+                        monthly_withdraw_with_contrib, monthly_withdraw_no_contrib, created_at
+                    FROM retirement_results
+                ''')
+                self.conn.execute('''
+                    INSERT INTO budget_history (
+                        user_id, name, incomes, expenses, total_income, total_expenses, remaining_balance, created_at
+                    )
+                    SELECT user_id, name, incomes, expenses, total_income, total_expenses, remaining_balance, created_at
+                    FROM budget_summary
+                ''')
+            if version < 2:
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS budget_items (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        kind TEXT NOT NULL,
+                        category TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        amount REAL NOT NULL,
+                        UNIQUE(user_id, kind, category, name),
+                        FOREIGN KEY(user_id) REFERENCES users(id)
+                    )
+                ''')
+                # Covers the cross-user aggregates without touching the table.
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_budget_items_kind_category "
+                    "ON budget_items (kind, category, amount)")
+                rows = self.conn.execute("SELECT user_id, name, incomes, expenses FROM budget_summary").fetchall()
+                for row in rows:
+                    try:
+                        _sync_budget_items(self.conn, [row])
+                    except (TypeError, ValueError, AttributeError):
+                        # Unreadable JSON; the summary row is kept but gets no items.
+                        continue
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def _retirement_row(self, user_id, starting_amount, annual_rate, years, yearly_contribution, result,
+                        save_timestamp, created_at):
+        return (
+            user_id,
+            save_timestamp,
+            starting_amount,
+            annual_rate,
+            years,
+            yearly_contribution,
+            result.get("balance_with_contrib"),
+            result.get("balance_no_contrib"),
+            result.get("annual_withdraw_with_contrib"),
+            result.get("annual_withdraw_no_contrib"),
+            result.get("monthly_withdraw_with_contrib"),
+            result.get("monthly_withdraw_no_contrib"),
+            created_at
+        )
+
+    def _budget_row(self, user_id, incomes, expenses, totals, save_timestamp, created_at):
+        return (
+            user_id,
+            save_timestamp,
+            json.dumps(incomes),
+            json.dumps(expenses),
+            totals.get("total_income"),
+            totals.get("total_expenses"),
+            totals.get("remaining_balance"),
+            created_at
+        )
+
+    def _fetch_record(self, record_class, query, params):
+        cursor = self.conn.cursor()
+        cursor.row_factory = record_class.from_row
+        return cursor.execute(query, params).fetchone()
 
     def upsert_retirement_result(self, user_id, starting_amount, annual_rate, years, yearly_contribution, result):
-        save_timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        created_at = datetime.datetime.now().isoformat()
-        query = "SELECT id FROM retirement_results WHERE user_id = ?"
-        cursor = self.conn.execute(query, (user_id,))
-        existing = cursor.fetchone()
-        if existing:
-            update_query = '''
-                UPDATE retirement_results 
-                SET name = ?, starting_amount = ?, annual_rate = ?, years = ?,
-                    yearly_contribution = ?, balance_with_contrib = ?,
-                    balance_no_contrib = ?, annual_withdraw_with_contrib = ?,
-                    annual_withdraw_no_contrib = ?, monthly_withdraw_with_contrib = ?,
-                    monthly_withdraw_no_contrib = ?, created_at = ?
-                WHERE user_id = ?
-            '''
-            self.conn.execute(update_query, (
-                save_timestamp,
-                starting_amount,
-                annual_rate,
-                years,
-                yearly_contribution,
-                result.get("balance_with_contrib"),
-                result.get("balance_no_contrib"),
-                result.get("annual_withdraw_with_contrib"),
-                result.get("annual_withdraw_no_contrib"),
-                result.get("monthly_withdraw_with_contrib"),
-                result.get("monthly_withdraw_no_contrib"),
-                created_at,
-                user_id
-            ))
+        save_timestamp, created_at = _timestamps()
+        row = self._retirement_row(
+            user_id, starting_amount, annual_rate, years, yearly_contribution, result, save_timestamp, created_at)
+        if self.writer:
+            self.writer.put(RETIREMENT_WRITES, user_id, row)
         else:
-            insert_query = '''
-                INSERT INTO retirement_results (
-                    user_id, name, starting_amount, annual_rate, years, yearly_contribution,
-                    balance_with_contrib, balance_no_contrib,
-                    annual_withdraw_with_contrib, annual_withdraw_no_contrib,
-                    monthly_withdraw_with_contrib, monthly_withdraw_no_contrib, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            '''
-            self.conn.execute(insert_query, (
-                user_id,
-                save_timestamp,
-                starting_amount,
-                annual_rate,
-                years,
-                yearly_contribution,
-                result.get("balance_with_contrib"),
-                result.get("balance_no_contrib"),
-                result.get("annual_withdraw_with_contrib"),
-                result.get("annual_withdraw_no_contrib"),
-                result.get("monthly_withdraw_with_contrib"),
-                result.get("monthly_withdraw_no_contrib"),
-                created_at
-            ))
-        self.conn.commit()
+            # The connection context manager rolls back on error, so a failed save never
+            # leaves the pooled connection holding the write lock.
+            with self.conn:
+                _run_writes(self.conn, RETIREMENT_WRITES, [row])
+        self.cache.invalidate(("retirement", user_id))
 
     def get_retirement_result(self, user_id):
-        query = "SELECT * FROM retirement_results WHERE user_id = ?"
-        cursor = self.conn.execute(query, (user_id,))
-        return cursor.fetchone()
+        """Return the user's latest saved RetirementRecord, or None. Cached until the next upsert."""
+        # retirement_results keeps exactly one row per user (the latest save), so this is a
+        # single lookup on its unique user_id index however long the history grows.
+        if self.writer and self.writer.is_pending(RETIREMENT_WRITES, user_id):
+            self.writer.flush()
+        return self.cache.get(("retirement", user_id),
+                              lambda: self._fetch_record(RetirementRecord, RETIREMENT_SELECT, (user_id,)))
 
     def upsert_budget_summary(self, user_id, incomes, expenses, totals):
-        save_timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        created_at = datetime.datetime.now().isoformat()
-        incomes_json = json.dumps(incomes)
-        expenses_json = json.dumps(expenses)
-        query = "SELECT id FROM budget_summary WHERE user_id = ?"
-        cursor = self.conn.execute(query, (user_id,))
-        existing = cursor.fetchone()
-        if existing:
-            update_query = '''
-                UPDATE budget_summary 
-                SET name = ?, incomes = ?, expenses = ?, total_income = ?,
-                    total_expenses = ?, remaining_balance = ?, created_at = ?
-                WHERE user_id = ?
-            '''
-            self.conn.execute(update_query, (
-                save_timestamp,
-                incomes_json,
-                expenses_json,
-                totals.get("total_income"),
-                totals.get("total_expenses"),
-                totals.get("remaining_balance"),
-                created_at,
-                user_id
-            ))
+        save_timestamp, created_at = _timestamps()
+        row = self._budget_row(user_id, incomes, expenses, totals, save_timestamp, created_at)
+        if self.writer:
+            self.writer.put(BUDGET_WRITES, user_id, row)
         else:
-            insert_query = '''
-                INSERT INTO budget_summary (
-                    user_id, name, incomes, expenses, total_income, total_expenses, remaining_balance, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            '''
-            self.conn.execute(insert_query, (
-                user_id,
-                save_timestamp,
-                incomes_json,
-                expenses_json,
-                totals.get("total_income"),
-                totals.get("total_expenses"),
-                totals.get("remaining_balance"),
-                created_at
-            ))
-        self.conn.commit()
+            with self.conn:
+                _run_writes(self.conn, BUDGET_WRITES, [row])
+        self.cache.invalidate(("budget", user_id))
 
     def get_budget_summary(self, user_id):
-        query = "SELECT * FROM budget_summary WHERE user_id = ?"
-        cursor = self.conn.execute(query, (user_id,))
-        return cursor.fetchone()
+        """Return the user's latest saved BudgetRecord, or None. Cached until the next upsert."""
+        # Latest save only; see get_budget_history for earlier ones.
+        if self.writer and self.writer.is_pending(BUDGET_WRITES, user_id):
+            self.writer.flush()
+        return self.cache.get(("budget", user_id),
+                              lambda: self._fetch_record(BudgetRecord, BUDGET_SELECT, (user_id,)))
+
+    def save_many(self, retirement_results=(), budget_summaries=()):
+        """
+        Upsert many users' results in a single transaction.
+        retirement_results holds (user_id, starting_amount, annual_rate, years, yearly_contribution, result)
+        tuples and budget_summaries holds (user_id, incomes, expenses, totals) tuples, matching the
+        arguments of the single-row upsert methods. Either may be any iterable, including a generator.
+        """
+        if self.writer:
+            # Commit queued saves first so they can't overwrite these rows later.
+            self.writer.flush()
+        save_timestamp, created_at = _timestamps()
+        retirement_rows = [self._retirement_row(*item, save_timestamp, created_at) for item in retirement_results]
+        budget_rows = [self._budget_row(*item, save_timestamp, created_at) for item in budget_summaries]
+        with self.conn:
+            _run_writes(self.conn, RETIREMENT_WRITES, retirement_rows)
+            _run_writes(self.conn, BUDGET_WRITES, budget_rows)
+        self.cache.invalidate()
+
+    def update_results(self, retirement_results=(), budget_summaries=()):
+        """
+        Write recomputed results over users' latest saves in a single transaction, for batch
+        recomputes (see simplesaver.batch). Takes the same tuples as save_many, but only the
+        computed columns change: the save name and created_at stay those of the user's own
+        save, budget items are left alone and nothing is added to the history tables.
+        """
+        if self.writer:
+            self.writer.flush()
+        result_keys = ("balance_with_contrib", "balance_no_contrib", "annual_withdraw_with_contrib",
+                       "annual_withdraw_no_contrib", "monthly_withdraw_with_contrib", "monthly_withdraw_no_contrib")
+        retirement_rows = [(*(result.get(key) for key in result_keys), user_id)
+                           for user_id, _, _, _, _, result in retirement_results]
+        budget_rows = [
+            (totals.get("total_income"), totals.get("total_expenses"), totals.get("remaining_balance"), user_id)
+            for user_id, _, _, totals in budget_summaries
+        ]
+        with self.conn:
+            self.conn.executemany(RETIREMENT_RESULT_UPDATE, retirement_rows)
+            self.conn.executemany(BUDGET_TOTALS_UPDATE, budget_rows)
+        self.cache.invalidate()
+
+    def get_budget_items(self, user_id):
+        """
+        Return the user's saved budget as (incomes, expenses) dicts, in the same shape
+        BudgetManager uses, read from budget_items.
+        """
+        if self.writer and self.writer.is_pending(BUDGET_WRITES, user_id):
+            self.writer.flush()
+        incomes = {}
+        expenses = {category: {} for category in EXPENSE_CATEGORIES}
+        query = "SELECT kind, category, name, amount FROM budget_items WHERE user_id = ? ORDER BY id"
+        for kind, category, name, amount in self.conn.execute(query, (user_id,)):
+            if kind == "income":
+                incomes[name] = amount
+            else:
+                expenses.setdefault(category, {})[name] = amount
+        return incomes, expenses
+
+    def add_budget_items(self, user_id, items, replace=()):
+        """
+        Add amounts to the user's budget items in one transaction, creating missing items.
+        items maps (kind, category, name) to an amount; kind is "income" (with category "")
+        or "expense". Items whose key is in replace are set to the amount instead of added to.
+        Used by budget_importer for chunked bulk imports.
+        """
+        if self.writer and self.writer.is_pending(BUDGET_WRITES, user_id):
+            self.writer.flush()
+        replaced = [(user_id, *key, amount) for key, amount in items.items() if key in replace]
+        added = [(user_id, *key, amount) for key, amount in items.items() if key not in replace]
+        with self.conn:
+            self.conn.executemany(BUDGET_ITEM_UPSERT, replaced)
+            self.conn.executemany(BUDGET_ITEM_ADD, added)
+
+    def get_category_totals(self, user_id=None):
+        """
+        Return {category: total expenses}, summed in SQL. With user_id=None the totals cover
+        every user.
+        """
+        self.flush()
+        if user_id is None:
+            query = "SELECT category, SUM(amount) FROM budget_items WHERE kind = 'expense' GROUP BY category"
+            params = ()
+        else:
+            query = ("SELECT category, SUM(amount) FROM budget_items WHERE user_id = ? AND kind = 'expense' "
+                     "GROUP BY category")
+            params = (user_id,)
+        totals = {category: 0.0 for category in EXPENSE_CATEGORIES}
+        totals.update(self.conn.execute(query, params).fetchall())
+        return totals
+
+    def get_average_category_totals(self):
+        """Return {category: average total expenses per user} across every user with a saved budget."""
+        self.flush()
+        users = self.conn.execute("SELECT COUNT(DISTINCT user_id) FROM budget_items").fetchone()[0]
+        totals = self.get_category_totals()
+        return {category: (total / users if users else 0.0) for category, total in totals.items()}
+
+    def get_total_income(self, user_id=None):
+        """Return total income for user_id, or across every user when user_id is None."""
+        self.flush()
+        if user_id is None:
+            row = self.conn.execute("SELECT SUM(amount) FROM budget_items WHERE kind = 'income'").fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT SUM(amount) FROM budget_items WHERE user_id = ? AND kind = 'income'", (user_id,)).fetchone()
+        return row[0] or 0.0
+
+    def _history_page(self, record_class, table, user_id, limit, before):
+        # Keyset pagination: newest first, continuing strictly after the (created_at, id) of the
+        # previous page's last row, so every page is an index range scan regardless of depth.
+        # History tables share their latest-row table's columns, so rows map onto the same records.
+        columns = ", ".join(record_class.__slots__)
+        if before is None:
+            query = f"SELECT {columns} FROM {table} WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?"
+            params = (user_id, limit)
+        else:
+            query = (f"SELECT {columns} FROM {table} WHERE user_id = ? AND (created_at, id) < (?, ?) "
+                     f"ORDER BY created_at DESC, id DESC LIMIT ?")
+            params = (user_id, before[0], before[1], limit)
+        cursor = self.conn.cursor()
+        cursor.row_factory = record_class.from_row
+        return cursor.execute(query, params).fetchall()
+
+    def get_retirement_history(self, user_id, limit=50, before=None):
+        """
+        Return up to `limit` saved retirement results for user_id as RetirementRecords, newest
+        first. To fetch the next page pass before=(record.created_at, record.id) from the last
+        record of the current page.
+        """
+        self.flush()
+        return self._history_page(RetirementRecord, "retirement_history", user_id, limit, before)
+
+    def get_budget_history(self, user_id, limit=50, before=None):
+        """
+        Return up to `limit` saved budget summaries for user_id as BudgetRecords, newest first.
+        To fetch the next page pass before=(record.created_at, record.id) from the last record.
+        """
+        self.flush()
+        return self._history_page(BudgetRecord, "budget_history", user_id, limit, before)
+
+    def flush(self):
+        """Block until every queued write-behind save is committed. A no-op without write-behind."""
+        if self.writer:
+            self.writer.flush()
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
 
 if __name__ == "__main__":
     dm = DataManager()
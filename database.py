@@ -0,0 +1,140 @@
+import sqlite3
+import threading
+import instrumentation
+
+# Applied to every new connection. WAL lets readers keep going while a writer commits, and
+# synchronous=NORMAL is durable across application crashes in WAL mode with far fewer fsyncs.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 67108864",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Prepared statements kept per connection. Large enough that every statement the managers
+# issue stays cached, so repeated saves skip re-parsing their SQL.
+STATEMENT_CACHE_SIZE = 256
+
+
+class SessionCache:
+    """
+    Read-through cache for lookups whose results only change through this process's own writes
+    (saved results, user profiles). Writers call invalidate() after committing. A load that was
+    running while an invalidation happened is returned but not cached, so a stale read can never
+    outlive the write that replaced it. Changes made by other processes are not seen until the
+    entry is invalidated or the provider is closed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.generation = 0
+
+    def get(self, key, load):
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key]
+            generation = self.generation
+        value = load()
+        with self.lock:
+            if generation == self.generation:
+                self.entries[key] = value
+        return value
+
+    def invalidate(self, key=None):
+        """Drop key, or every entry when key is None."""
+        with self.lock:
+            self.generation += 1
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+
+class ConnectionProvider:
+    """
+    Hands out one SQLite connection per thread for a database file.
+    UserManager and DataManager share a provider, so the GUI thread reuses a single connection
+    no matter how many managers are created. Worker threads hand theirs back with release()
+    when a task ends, and the next task on any thread picks it up from the idle pool.
+    Managers sharing a provider also share its SessionCache, which outlives any one manager.
+    """
+
+    def __init__(self, db_name="app_data.db"):
+        self.db_name = db_name
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = []
+        self.idle = []
+        self.cache = SessionCache()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            with self.lock:
+                conn = self.idle.pop() if self.idle else None
+            if conn is None:
+                conn = self.open()
+            self.local.conn = conn
+        return conn
+
+    def open(self):
+        # check_same_thread is off so pooled connections can move between threads; a
+        # connection is only ever used by the thread currently holding it.
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        instrumentation.attach(conn)
+        with self.lock:
+            self.connections.append(conn)
+        return conn
+
+    def release(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            return
+        self.local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self.lock:
+            self.idle.append(conn)
+
+    def close(self):
+        with self.lock:
+            connections, self.connections, self.idle = self.connections, [], []
+        for conn in connections:
+            conn.close()
+        self.local = threading.local()
+        self.cache.invalidate()
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(db_name="app_data.db"):
+    """Return the shared ConnectionProvider for db_name, creating it on first use."""
+    with _providers_lock:
+        provider = _providers.get(db_name)
+        if provider is None:
+            provider = _providers[db_name] = ConnectionProvider(db_name)
+        return provider
+
+
+def release_thread():
+    """Return the calling thread's connections to their idle pools; call when a worker task ends."""
+    with _providers_lock:
+        providers = list(_providers.values())
+    for provider in providers:
+        provider.release()
+
+
+def close_all():
+    """Close every connection opened through get_provider."""
+    with _providers_lock:
+        providers = list(_providers.values())
+        _providers.clear()
+    for provider in providers:
+        provider.close()
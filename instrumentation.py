@@ -0,0 +1,251 @@
+"""
+Opt-in timing for the application's hot paths.
+
+Spans wrap the GUI actions (calculate & save, save budget, login), chart updates and every
+public DataManager/UserManager method; SQLite statements run inside a span are timed too.
+Each name gets a log-bucketed histogram, so recording is O(1) and memory stays fixed however
+long the app runs, and percentiles are accurate to a few percent.
+
+Instrumentation is off unless SIMPLESAVER_INSTRUMENT is set (to 1, or to a file path that
+receives a JSON dump at exit) or enable() is called. While off, span() returns a shared no-op
+context manager and decorated functions cost one global lookup per call.
+"""
+import atexit
+import functools
+import inspect
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+
+enabled = False
+_lock = threading.Lock()
+_histograms = {}
+_sql_steps = {}
+_local = threading.local()
+_NULL_SPAN = nullcontext()
+
+# Buckets grow by 5% from 1 microsecond, so a reported percentile is within 5% of the truth.
+_BUCKET_BASE = 1e-6
+_BUCKET_GROWTH = math.log(1.05)
+# The progress handler runs every this many SQLite VM instructions while a statement executes.
+PROGRESS_INTERVAL = 1000
+
+
+class Histogram:
+    """Log-bucketed duration histogram with exact count, total, min and max."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        index = int(math.log(seconds / _BUCKET_BASE) / _BUCKET_GROWTH) if seconds > _BUCKET_BASE else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Upper edge of the bucket, clamped to what was actually observed.
+                upper = _BUCKET_BASE * math.exp((index + 1) * _BUCKET_GROWTH)
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "min_ms": self.min * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p95_ms": self.percentile(95) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+def record(name, seconds):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        _local.depth = getattr(_local, "depth", 0) + 1
+        self.start = time.perf_counter()
+        _finish_statement(self.start)
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _local.depth -= 1
+        _finish_statement(end)
+        record(self.name, end - self.start)
+        return False
+
+
+def span(name):
+    """Context manager timing its block under name; a shared no-op when instrumentation is off."""
+    return _Span(name) if enabled else _NULL_SPAN
+
+
+def timed(name):
+    """
+    Decorator timing every call of the function under name.
+    The wrapper takes *args, so a Qt slot connected to a signal with arguments (e.g. clicked)
+    also needs @pyqtSlot() to keep PyQt from passing them on.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_methods(prefix):
+    """Class decorator applying timed to every public method, named "<prefix>.<method>"."""
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and inspect.isfunction(value):
+                setattr(cls, attr, timed(f"{prefix}.{attr}")(value))
+        return cls
+    return decorate
+
+
+# --- SQLite statement timing ---
+# set_trace_callback reports each statement as it starts, with its parameters filled in. The
+# literals are stripped before the text is used as a metric name, so values (emails, password
+# hashes, amounts) never reach the metrics and repeated statements share one histogram.
+_LITERALS = re.compile(r"'(?:[^']|'')*'|[xX]'[0-9A-Fa-f]*'|\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement):
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+
+def _finish_statement(end):
+    # A statement is timed from its trace callback until the next statement on this thread
+    # starts or a span starts or ends. Statements outside any span are not timed, since
+    # idle time would otherwise be charged to the last one.
+    pending = getattr(_local, "statement", None)
+    if pending is None:
+        return
+    _local.statement = None
+    key, start, steps_at_start = pending
+    record(key, end - start)
+    steps = getattr(_local, "steps", 0) - steps_at_start
+    with _lock:
+        _sql_steps[key] = _sql_steps.get(key, 0) + steps * PROGRESS_INTERVAL
+
+
+def _trace(statement):
+    now = time.perf_counter()
+    _finish_statement(now)
+    if getattr(_local, "depth", 0):
+        _local.statement = ("sql: " + normalize_sql(statement), now, getattr(_local, "steps", 0))
+
+
+def _progress():
+    _local.steps = getattr(_local, "steps", 0) + 1
+    return 0
+
+
+def attach(conn):
+    """Install the statement tracing callbacks on conn if instrumentation is on."""
+    if enabled:
+        conn.set_trace_callback(_trace)
+        conn.set_progress_handler(_progress, PROGRESS_INTERVAL)
+
+
+def _attach_open_connections():
+    from database import _providers, _providers_lock
+    with _providers_lock:
+        providers = list(_providers.values())
+    for provider in providers:
+        with provider.lock:
+            connections = list(provider.connections)
+        for conn in connections:
+            attach(conn)
+
+
+def enable(dump_path=None):
+    """Turn instrumentation on, including for connections that are already open."""
+    global enabled
+    enabled = True
+    _attach_open_connections()
+    if dump_path:
+        atexit.register(dump, dump_path)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _sql_steps.clear()
+
+
+def snapshot():
+    """Return {"spans": {...}, "sql": {...}} with count, total, mean and p50/p95/p99 in milliseconds."""
+    with _lock:
+        summaries = {name: histogram.summary() for name, histogram in _histograms.items()}
+        steps = dict(_sql_steps)
+    spans = {name: summary for name, summary in summaries.items() if not name.startswith("sql: ")}
+    sql = {}
+    for name, summary in summaries.items():
+        if name.startswith("sql: "):
+            statement = name[len("sql: "):]
+            sql[statement] = dict(summary, vm_steps=steps.get(name, 0))
+    return {"spans": spans, "sql": sql}
+
+
+def dump(path):
+    """Write snapshot() to path as JSON."""
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2, sort_keys=True)
+
+
+def report(limit=30):
+    """Return a plain-text table of the slowest spans and statements by total time."""
+    data = snapshot()
+    lines = []
+    for title, rows in (("Spans", data["spans"]), ("SQL statements", data["sql"])):
+        lines.append(f"{title}:")
+        lines.append(f"{'count':>7} {'total ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  name")
+        ordered = sorted(rows.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:limit]
+        for name, s in ordered:
+            lines.append(f"{s['count']:>7} {s['total_ms']:>10.2f} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} "
+                         f"{s['p99_ms']:>9.3f}  {name[:120]}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+if os.environ.get("SIMPLESAVER_INSTRUMENT"):
+    _setting = os.environ["SIMPLESAVER_INSTRUMENT"]
+    enable(None if _setting.lower() in ("1", "true", "yes") else _setting)
@@ -0,0 +1,122 @@
+"""
+Login/logout cycle check for the dashboard. Runs headless on Qt's offscreen platform against a
+database in a temporary directory: logs two users in and out alternately, visiting every tab
+and logging out right after a "Calculate & Save", and fails if widgets, open file descriptors
+or resident memory keep growing, or if a save made just before logout is lost.
+
+    python leakcheck.py [--cycles 1000] [--warmup 50] [--max-rss-growth 8]
+
+Growth is measured from the end of the warmup cycles, once caches and lazily built widgets
+have settled. Exits with status 1 when the stacked widget gains pages, the FD count rises,
+RSS grows by more than --max-rss-growth MB or any save is lost. Linux only (reads /proc/self).
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def _sample(window):
+    gc.collect()
+    return {"rss_kb": _rss_kb(), "fds": _open_fds(), "stack": window.stack.count()}
+
+
+def run(cycles=1000, warmup=50, progress=None):
+    """Run the login/logout cycles and return {"baseline": sample, "final": sample, "lost_saves": n, ...}."""
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    # The GUI opens app_data.db in the working directory.
+    os.chdir(tempfile.mkdtemp(prefix="leakcheck-"))
+    import main
+    from database import close_all
+    from user_manager import UserManager
+
+    # Cheap hashes: the accounts only exist for this run.
+    um = UserManager(rounds=4)
+    users = []
+    for email in ("first@example.com", "second@example.com"):
+        um.register_user(email, "Leak", "Check", "password")
+        users.append((email, um.get_user(email).id))
+
+    window = main.MainWindow()
+    window.show()
+    baseline = None
+    lost_saves = 0
+    start = time.perf_counter()
+    for cycle in range(warmup + cycles):
+        email, user_id = users[cycle % 2]
+        window.switchToDashboard(email, user_id)
+        dashboard = window.dashboardWidget
+        for index in range(dashboard.tabs.count()):
+            dashboard.tabs.setCurrentIndex(index)
+        app.processEvents()
+        # Save, then log out before the background save has finished.
+        retirement = dashboard.retirementTab
+        for edit, value in zip((retirement.initialEdit, retirement.rateEdit, retirement.yearsEdit,
+                                retirement.contributionEdit), (cycle, 5, 30, 1000)):
+            edit.setText(str(value))
+        retirement.calculateAndSave()
+        dashboard.profileTab.logout()
+        retirement.pool.waitForDone()
+        app.processEvents()
+        saved = dashboard.dm.get_retirement_result(user_id)
+        if saved is None or saved.starting_amount != cycle:
+            lost_saves += 1
+        if cycle + 1 == warmup:
+            baseline = _sample(window)
+        if progress and (cycle + 1) % 100 == 0:
+            progress(cycle + 1)
+    final = _sample(window)
+    seconds = time.perf_counter() - start
+    window.close()
+    close_all()
+    return {"cycles": cycles, "baseline": baseline, "final": final, "lost_saves": lost_saves,
+            "seconds": round(seconds, 1)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="leakcheck")
+    parser.add_argument("--cycles", type=int, default=1000, help="Measured login/logout cycles.")
+    parser.add_argument("--warmup", type=int, default=50, help="Cycles run before the baseline is taken.")
+    parser.add_argument("--max-rss-growth", type=float, default=8.0,
+                        help="Allowed RSS growth over the measured cycles, in MB (default: 8).")
+    args = parser.parse_args(argv)
+    result = run(max(1, args.cycles), max(1, args.warmup),
+                 progress=lambda n: print(f"\r{n} cycles", end="", file=sys.stderr, flush=True))
+    baseline, final = result["baseline"], result["final"]
+    print(f"\n{result['cycles']} cycles in {result['seconds']}s", file=sys.stderr)
+    failures = []
+    if final["stack"] > baseline["stack"]:
+        failures.append(f"stacked widget grew from {baseline['stack']} to {final['stack']} pages")
+    if final["fds"] > baseline["fds"]:
+        failures.append(f"open file descriptors grew from {baseline['fds']} to {final['fds']}")
+    rss_growth = (final["rss_kb"] - baseline["rss_kb"]) / 1024
+    print(f"RSS growth {rss_growth:.1f} MB, FDs {baseline['fds']} -> {final['fds']}, "
+          f"pages {baseline['stack']} -> {final['stack']}")
+    if rss_growth > args.max_rss_growth:
+        failures.append(f"RSS grew by {rss_growth:.1f} MB (limit {args.max_rss_growth} MB)")
+    if result["lost_saves"]:
+        failures.append(f"{result['lost_saves']} saves made just before logout were lost")
+    for failure in failures:
+        print(f"LEAK: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Load test for server.py. Opens --connections keep-alive connections to a running instance and
+sends requests back to back on each for --duration seconds, then reports throughput and
+latency percentiles as JSON.
+
+    python loadtest.py [--url http://127.0.0.1:8080] [--connections 64] [--duration 10]
+                       [--scenario calculate|yearly|read|save|mixed]
+
+"read", "save" and "mixed" register (if needed) and log in the --email account once, then
+send its session token with every request for that user's data.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+def _calculate_body(rng, yearly=False):
+    return {
+        "initial_investment": round(rng.uniform(0, 100000), 2),
+        "annual_rate": round(rng.uniform(0, 12), 2),
+        "years": rng.randint(1, 50),
+        "yearly_contribution": round(rng.uniform(0, 20000), 2),
+        "yearly": yearly,
+    }
+
+
+def _next_request(scenario, rng, user_id):
+    if scenario == "mixed":
+        scenario = rng.choices(("calculate", "yearly", "read", "save"), weights=(60, 10, 25, 5))[0]
+    if scenario == "calculate":
+        return "POST", "/retirement/calculate", _calculate_body(rng)
+    if scenario == "yearly":
+        return "POST", "/retirement/calculate", _calculate_body(rng, yearly=True)
+    if scenario == "read":
+        return "GET", f"/users/{user_id}/retirement", None
+    return "PUT", f"/users/{user_id}/retirement", _calculate_body(rng)
+
+
+async def _request(reader, writer, host, method, path, body, token=None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n{auth}"
+        f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _session(host, port, email, password):
+    # Returns (user id, token) for the load-test account, registering it on a fresh database.
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await _request(reader, writer, host, "POST", "/users",
+                       {"email": email, "first_name": "Load", "last_name": "Test", "password": password})
+        status, body = await _request(reader, writer, host, "POST", "/login", {"email": email, "password": password})
+        if status != 200:
+            raise SystemExit(f"Login as {email} failed with status {status}.")
+        session = json.loads(body)
+        # Make sure "read" finds a saved result.
+        await _request(reader, writer, host, "PUT", f"/users/{session['id']}/retirement",
+                       _calculate_body(random.Random(0)), session["token"])
+        return session["id"], session["token"]
+    finally:
+        writer.close()
+
+
+async def _worker(host, port, scenario, user_id, token, deadline, seed, latencies, statuses):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = _next_request(scenario, rng, user_id)
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, method, path, body, token)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(url="http://127.0.0.1:8080", connections=64, duration=10.0, scenario="calculate",
+              email="loadtest@example.com", password="loadtest-password", seed=0):
+    """Run the load test and return a dict with requests/sec, latency percentiles in ms and status counts."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    user_id = token = None
+    if scenario in ("read", "save", "mixed"):
+        user_id, token = await _session(host, port, email, password)
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _worker(host, port, scenario, user_id, token, deadline, seed + i, latencies, statuses) for i in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))] * 1e3 if latencies else 0.0
+
+    return {
+        "scenario": scenario,
+        "connections": connections,
+        "seconds": round(elapsed, 3),
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1e3, 3) if latencies else 0.0,
+            "p50": round(percentile(50), 3),
+            "p95": round(percentile(95), 3),
+            "p99": round(percentile(99), 3),
+            "max": round(latencies[-1] * 1e3, 3) if latencies else 0.0,
+        },
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="loadtest")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Base URL of a running server.py.")
+    parser.add_argument("--connections", type=int, default=64, help="Concurrent keep-alive connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run.")
+    parser.add_argument("--scenario", default="calculate", choices=("calculate", "yearly", "read", "save", "mixed"))
+    parser.add_argument("--email", default="loadtest@example.com", help="Account used by read/save requests.")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.url, args.connections, args.duration, args.scenario, args.email, args.password,
+                             args.seed))
+    print(json.dumps(report, indent=2))
+    failed = sum(count for status, count in report["statuses"].items() if not status.startswith("2"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
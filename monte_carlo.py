@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+WITHDRAW_RATE = 0.04
+
+
+def _simulate_chunk(seed, paths, initial_investment, annual_rate, years, yearly_contribution,
+                    volatility, retirement_years):
+    """
+    Simulate one chunk of return paths.
+    Returns (final balances with contributions, whether each path lasted through retirement).
+    """
+    rng = np.random.default_rng(seed)
+    # One (paths, years) matrix of yearly returns for the growth phase and another for the
+    # withdrawal phase. Returns are floored at -100% so a balance can't go negative from growth.
+    growth = np.maximum(rng.normal(annual_rate / 100, volatility / 100, size=(paths, years)), -1.0)
+    balances = np.full(paths, float(initial_investment))
+    for year in range(years):
+        balances = (balances + yearly_contribution) * (1 + growth[:, year])
+
+    retirement_returns = np.maximum(
+        rng.normal(annual_rate / 100, volatility / 100, size=(paths, retirement_years)), -1.0)
+    withdrawal = balances * WITHDRAW_RATE
+    remaining = balances.copy()
+    lasted = np.ones(paths, dtype=bool)
+    for year in range(retirement_years):
+        remaining = remaining - withdrawal
+        lasted &= remaining >= 0
+        remaining = np.maximum(remaining, 0) * (1 + retirement_returns[:, year])
+    return balances, lasted
+
+
+def simulate_retirement(initial_investment, annual_rate, years, yearly_contribution, volatility=15.0,
+                        paths=100_000, retirement_years=30, seed=None, chunk_size=10_000, workers=None,
+                        percentiles=(10, 25, 50, 75, 90)):
+    """
+    Monte Carlo version of calculate_retirement.
+    Each path draws a normally distributed return every year (mean annual_rate, standard deviation
+    volatility, both in %). Paths are simulated in chunks of chunk_size so memory stays bounded, and
+    chunks are spread over a process pool of `workers` processes (1 runs everything in-process).
+    Every chunk gets its own child of `seed`, so results are reproducible for any worker count.
+    Returns a dictionary with percentile balances and withdrawals and the probability that
+    withdrawing 4% of the final balance each year lasts for retirement_years.
+    """
+    if paths <= 0:
+        raise ValueError("paths must be a positive number of simulations.")
+    chunk_sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [
+        (chunk_seed, size, initial_investment, annual_rate, years, yearly_contribution,
+         volatility, retirement_years)
+        for chunk_seed, size in zip(seeds, chunk_sizes)
+    ]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(args))
+    if workers <= 1:
+        results = [_simulate_chunk(*chunk_args) for chunk_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, *zip(*args)))
+
+    balances = np.concatenate([chunk_balances for chunk_balances, _ in results])
+    lasted = sum(int(chunk_lasted.sum()) for _, chunk_lasted in results)
+    balance_percentiles = np.percentile(balances, percentiles)
+    return {
+        "paths": paths,
+        "balance_percentiles": {p: round(float(val), 2) for p, val in zip(percentiles, balance_percentiles)},
+        "annual_withdraw_percentiles": {
+            p: round(float(val) * WITHDRAW_RATE, 2) for p, val in zip(percentiles, balance_percentiles)
+        },
+        "monthly_withdraw_percentiles": {
+            p: round(float(val) * WITHDRAW_RATE / 12, 2) for p, val in zip(percentiles, balance_percentiles)
+        },
+        "success_probability": round(lasted / paths, 4)
+    }
+
+if __name__ == "__main__":
+    try:
+        initial_investment = float(input("Enter starting amount: "))
+        annual_rate = float(input("Enter annual rate (in %): "))
+        years = int(input("Enter number of years for growth: "))
+        yearly_contribution = float(input("Enter yearly contribution: "))
+        volatility = float(input("Enter yearly volatility (in %): "))
+    except ValueError:
+        print("Please enter valid numerical values.")
+        exit(1)
+    results = simulate_retirement(initial_investment, annual_rate, years, yearly_contribution, volatility)
+    print("\nMonte Carlo Results:")
+    for key, val in results.items():
+        print(f"{key}: {val}")
@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
 )
 from user_manager import UserManager
 from data_manager import DataManager
+from auth_worker import start_auth_worker
 
 class ProfileWidget(QWidget):
     def __init__(self, email, user_id, parent=None):
@@ -11,6 +12,7 @@ class ProfileWidget(QWidget):
         self.email = email
         self.user_id = user_id
         self.um = UserManager()
+        self.authWorker = None
         self.initUI()
 
     def initUI(self):
@@ -29,25 +31,37 @@ class ProfileWidget(QWidget):
         updateProfileButton = QPushButton("Update Profile")
         updateProfileButton.clicked.connect(self.updateProfile)
 
-        changePasswordButton = QPushButton("Change Password")
-        changePasswordButton.clicked.connect(self.changePassword)
+        self.changePasswordButton = QPushButton("Change Password")
+        self.changePasswordButton.clicked.connect(self.changePassword)
 
         logoutButton = QPushButton("Logout")
         logoutButton.clicked.connect(self.logout)
 
         layout.addLayout(formLayout)
         layout.addWidget(updateProfileButton)
-        layout.addWidget(changePasswordButton)
+        layout.addWidget(self.changePasswordButton)
         layout.addWidget(logoutButton)
 
         self.setLayout(layout)
         self.loadUserInfo()
 
+    def setUser(self, email, user_id):
+        self.clear()
+        self.email = email
+        self.user_id = user_id
+        self.emailEdit.setText(email)
+        self.loadUserInfo()
+
+    def clear(self):
+        self.emailEdit.clear()
+        self.firstNameEdit.clear()
+        self.lastNameEdit.clear()
+
     def loadUserInfo(self):
         user = self.um.get_user(self.email)
         if user:
-            self.firstNameEdit.setText(user[2])
-            self.lastNameEdit.setText(user[3])
+            self.firstNameEdit.setText(user.first_name)
+            self.lastNameEdit.setText(user.last_name)
 
     def updateProfile(self):
         first_name = self.firstNameEdit.text()
@@ -62,10 +76,23 @@ class ProfileWidget(QWidget):
         if ok and new_password:
             first_name = self.firstNameEdit.text()
             last_name = self.lastNameEdit.text()
-            if self.um.update_user_info(self.email, first_name, last_name, new_password):
-                QMessageBox.information(self, "Password Updated", "Password changed successfully.")
-            else:
-                QMessageBox.warning(self, "Update Failed", "Failed to change password.")
+            self.changePasswordButton.setEnabled(False)
+            self.changePasswordButton.setText("Changing Password...")
+            self.authWorker = start_auth_worker(self.um.update_user_info, self.email, first_name, last_name,
+                                                new_password, on_finished=self.onPasswordChanged,
+                                                on_failed=self.onPasswordChangeFailed)
+
+    def onPasswordChanged(self, updated):
+        self.authWorker = None
+        self.changePasswordButton.setEnabled(True)
+        self.changePasswordButton.setText("Change Password")
+        if updated:
+            QMessageBox.information(self, "Password Updated", "Password changed successfully.")
+        else:
+            QMessageBox.warning(self, "Update Failed", "Failed to change password.")
+
+    def onPasswordChangeFailed(self, message):
+        self.onPasswordChanged(False)
 
     def logout(self):
         self.window().switchToLogin()
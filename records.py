@@ -0,0 +1,81 @@
+"""
+Typed, read-only records for the rows the GUI reads back: one attribute per column, stored in
+__slots__ so a record costs no more than the tuple it replaces. Use a record class's
+from_row as a cursor's row_factory to build records straight from query results.
+"""
+
+
+class Record:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes {len(self.__slots__)} values, got {len(values)}")
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_row(cls, cursor, row):
+        return cls(*row)
+
+    def __setattr__(self, name, value):
+        # Records are shared through the session cache, so they must not change under a reader.
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, index):
+        # Positional access matches the column order of the table, like the old row tuples.
+        return tuple(self)[index]
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self, exclude=()):
+        return {name: getattr(self, name) for name in self.__slots__ if name not in exclude}
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class UserRecord(Record):
+    __slots__ = ("id", "email", "first_name", "last_name", "password")
+
+
+class RetirementRecord(Record):
+    # "name" holds the readable save timestamp, as in the retirement_results table.
+    __slots__ = (
+        "id", "user_id", "name", "starting_amount", "annual_rate", "years", "yearly_contribution",
+        "balance_with_contrib", "balance_no_contrib",
+        "annual_withdraw_with_contrib", "annual_withdraw_no_contrib",
+        "monthly_withdraw_with_contrib", "monthly_withdraw_no_contrib", "created_at"
+    )
+
+    def result(self):
+        """Return the saved results in the dictionary shape calculate_retirement produces."""
+        return {
+            "balance_with_contrib": self.balance_with_contrib,
+            "balance_no_contrib": self.balance_no_contrib,
+            "annual_withdraw_with_contrib": self.annual_withdraw_with_contrib,
+            "annual_withdraw_no_contrib": self.annual_withdraw_no_contrib,
+            "monthly_withdraw_with_contrib": self.monthly_withdraw_with_contrib,
+            "monthly_withdraw_no_contrib": self.monthly_withdraw_no_contrib
+        }
+
+
+class BudgetRecord(Record):
+    # incomes and expenses are the JSON snapshots stored in budget_summary.
+    __slots__ = (
+        "id", "user_id", "name", "incomes", "expenses",
+        "total_income", "total_expenses", "remaining_balance", "created_at"
+    )
@@ -1,11 +1,34 @@
+import math
+import sys
+from functools import lru_cache
+import numpy as np
+
+
+def _balance_with_contrib(initial_investment, annual_rate, years, yearly_contribution):
+    # Contributions are added at the start of each year (an annuity-due), so the balance
+    # is P*g^n + C*g*(g^n - 1)/(g - 1), which reduces to P + C*n at a zero rate.
+    if years <= 0:
+        return initial_investment
+    if annual_rate == 0:
+        return float(initial_investment + yearly_contribution * years)
+    rate = annual_rate / 100
+    growth = 1 + rate
+    growth_n = growth ** years
+    return initial_investment * growth_n + yearly_contribution * growth * _annuity_factor(rate, years)
+
+def _annuity_factor(rate, years):
+    # (g^n - 1)/(g - 1) for g = 1 + rate. g^n - 1 cancels catastrophically at small rates, so it
+    # is taken from expm1/log1p, which keep full precision there (they need g > 0).
+    if rate > -1:
+        return math.expm1(years * math.log1p(rate)) / rate
+    return ((1 + rate) ** years - 1) / rate
+
 def calculate_retirement(initial_investment, annual_rate, years, yearly_contribution):
     """
     Calculate final retirement balances and safe withdrawal amounts.
     Returns a dictionary with final balances and withdrawal amounts.
     """
-    balance_with_contrib = initial_investment
-    for _ in range(years):
-        balance_with_contrib = (balance_with_contrib + yearly_contribution) * (1 + annual_rate / 100)
+    balance_with_contrib = _balance_with_contrib(initial_investment, annual_rate, years, yearly_contribution)
     balance_no_contrib = initial_investment * ((1 + annual_rate / 100) ** years)
     annual_withdraw_with_contrib = balance_with_contrib * 0.04
     annual_withdraw_no_contrib = balance_no_contrib * 0.04
@@ -20,11 +43,17 @@ def calculate_retirement(initial_investment, annual_rate, years, yearly_contribu
         "monthly_withdraw_no_contrib": round(monthly_withdraw_no_contrib, 2)
     }
 
-def calculate_retirement_yearly(initial_investment, annual_rate, years, yearly_contribution):
+def calculate_retirement_yearly(initial_investment, annual_rate, years, yearly_contribution, method="loop"):
     """
     Calculate the balance at the end of each year (with contributions) and without contributions.
+    method="cumprod" builds the series from a cumulative product of growth factors instead of
+    stepping year by year.
     Returns two lists: (balances_with_contrib, balances_without_contrib)
     """
+    if method == "cumprod":
+        return _yearly_cumprod(initial_investment, annual_rate, years, yearly_contribution)
+    if method != "loop":
+        raise ValueError(f"Unknown method '{method}'. Choose 'loop' or 'cumprod'.")
     balances_with = []
     balances_without = []
     current_with = initial_investment
@@ -36,7 +65,261 @@ def calculate_retirement_yearly(initial_investment, annual_rate, years, yearly_c
         balances_without.append(round(current_without,2))
     return balances_with, balances_without
 
+def _near_half_cent(values):
+    # Values within float noise of a half cent, where two ways of computing the same balance
+    # can round to different cents.
+    scaled = np.abs(values) * 100
+    return np.abs(scaled - np.floor(scaled) - 0.5) < 1e-11 * np.maximum(scaled, 1)
+
+def _yearly_cumprod(initial_investment, annual_rate, years, yearly_contribution):
+    growth = 1 + annual_rate / 100
+    factors = np.cumprod(np.full(max(years, 0), growth))
+    # Multiplying the initial amount in first, as the loop does, makes the balances without
+    # contributions match it exactly; initial * factors rounds differently.
+    steps = np.full(max(years, 0), growth)
+    steps[:1] *= initial_investment
+    current_without = np.cumprod(steps)
+    if annual_rate == 0:
+        current_with = initial_investment + yearly_contribution * np.arange(1, max(years, 0) + 1, dtype=float)
+    else:
+        annuity = _annuity_factor_batch(np.full(len(factors), annual_rate / 100), np.arange(1, len(factors) + 1), False)
+        current_with = initial_investment * factors + yearly_contribution * growth * annuity
+    if _near_half_cent(current_with).any():
+        # The closed form can land on the other side of a half cent from the loop; the rare
+        # series with such a tie are stepped year by year so both methods round the same.
+        return calculate_retirement_yearly(initial_investment, annual_rate, years, yearly_contribution)
+    balances_with = [round(val, 2) for val in current_with.tolist()]
+    balances_without = [round(val, 2) for val in current_without.tolist()]
+    return balances_with, balances_without
+
+def _batch_inputs(initial_investments, annual_rates, years, yearly_contributions):
+    initial = np.asarray(initial_investments, dtype=float)
+    rates = np.asarray(annual_rates, dtype=float)
+    horizons = np.asarray(years, dtype=int)
+    contributions = np.asarray(yearly_contributions, dtype=float)
+    initial, rates, horizons, contributions = np.broadcast_arrays(initial, rates, horizons, contributions)
+    return np.atleast_1d(initial), np.atleast_1d(rates), np.atleast_1d(horizons), np.atleast_1d(contributions)
+
+def _round_cents(values):
+    # np.round scales by 100 before rounding, which can land half a cent the other way
+    # from Python's round() on near-ties. Those few elements are redone with round().
+    rounded = np.round(values, 2)
+    scaled = np.abs(values) * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6 * np.maximum(scaled, 1)
+    for index in zip(*np.nonzero(near_tie)):
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
+
+def _annuity_factor_batch(fractions, horizons, zero_rate):
+    # Vectorized _annuity_factor; zero-rate entries get a placeholder the caller replaces.
+    positive = fractions > -1
+    growth_n_minus_1 = np.where(positive, np.expm1(horizons * np.log1p(np.where(positive, fractions, 0.0))),
+                                (1 + fractions) ** horizons - 1)
+    return growth_n_minus_1 / np.where(zero_rate, 1.0, fractions)
+
+def _balance_with_contrib_batch(initial, rates, horizons, contributions):
+    # Same annuity-due closed form as _balance_with_contrib, evaluated per scenario.
+    fractions = rates / 100
+    growth = 1 + fractions
+    growth_n = growth ** horizons
+    zero_rate = rates == 0
+    balance = initial * growth_n + contributions * growth * _annuity_factor_batch(fractions, horizons, zero_rate)
+    balance = np.where(zero_rate, initial + contributions * horizons, balance)
+    return np.where(horizons <= 0, initial, balance)
+
+def _grow_batch(initial, rates, horizons, contributions):
+    # Steps every scenario through the same recurrence as calculate_retirement_yearly, one
+    # year per iteration across all scenarios. Scenarios whose horizon has passed are
+    # masked out and their remaining columns stay NaN.
+    n = initial.shape[0]
+    max_years = max(int(horizons.max()), 0) if n else 0
+    growth = 1 + rates / 100
+    current_with = initial.copy()
+    current_without = initial.copy()
+    yearly_with = np.full((n, max_years), np.nan)
+    yearly_without = np.full((n, max_years), np.nan)
+    for year in range(max_years):
+        active = year < horizons
+        current_with = np.where(active, (current_with + contributions) * growth, current_with)
+        current_without = np.where(active, current_without * growth, current_without)
+        yearly_with[active, year] = current_with[active]
+        yearly_without[active, year] = current_without[active]
+    return yearly_with, yearly_without
+
+def calculate_retirement_batch(initial_investments, annual_rates, years, yearly_contributions):
+    """
+    Vectorized calculate_retirement for many scenarios at once.
+    Arguments are array-likes (or scalars) broadcast to a common length.
+    Returns a dictionary with the same keys as calculate_retirement, each holding a NumPy array.
+    """
+    initial, rates, horizons, contributions = _batch_inputs(
+        initial_investments, annual_rates, years, yearly_contributions)
+    balance_with_contrib = _balance_with_contrib_batch(initial, rates, horizons, contributions)
+    balance_no_contrib = initial * ((1 + rates / 100) ** horizons)
+    annual_withdraw_with_contrib = balance_with_contrib * 0.04
+    annual_withdraw_no_contrib = balance_no_contrib * 0.04
+    monthly_withdraw_with_contrib = annual_withdraw_with_contrib / 12
+    monthly_withdraw_no_contrib = annual_withdraw_no_contrib / 12
+    return {
+        "balance_with_contrib": _round_cents(balance_with_contrib),
+        "balance_no_contrib": _round_cents(balance_no_contrib),
+        "annual_withdraw_with_contrib": _round_cents(annual_withdraw_with_contrib),
+        "annual_withdraw_no_contrib": _round_cents(annual_withdraw_no_contrib),
+        "monthly_withdraw_with_contrib": _round_cents(monthly_withdraw_with_contrib),
+        "monthly_withdraw_no_contrib": _round_cents(monthly_withdraw_no_contrib)
+    }
+
+def calculate_retirement_yearly_batch(initial_investments, annual_rates, years, yearly_contributions):
+    """
+    Vectorized calculate_retirement_yearly for many scenarios at once.
+    Returns two (scenarios, max(years)) matrices: (balances_with_contrib, balances_without_contrib).
+    Row i holds scenario i's yearly balances; columns past its horizon are NaN.
+    """
+    initial, rates, horizons, contributions = _batch_inputs(
+        initial_investments, annual_rates, years, yearly_contributions)
+    yearly_with, yearly_without = _grow_batch(initial, rates, horizons, contributions)
+    return _round_cents(yearly_with), _round_cents(yearly_without)
+
+def _rounded(values, ndigits):
+    # Cache keys: amounts are rounded to cents and rates to 4 decimals so inputs that only
+    # differ by float noise share one entry.
+    return tuple(round(float(val), ndigits) for val in np.atleast_1d(values))
+
+@lru_cache(maxsize=1024)
+def _calculate_retirement_cached(initial_investment, annual_rate, years, yearly_contribution):
+    return calculate_retirement(initial_investment, annual_rate, years, yearly_contribution)
+
+def calculate_retirement_cached(initial_investment, annual_rate, years, yearly_contribution):
+    """
+    calculate_retirement backed by an LRU cache keyed on the rounded inputs.
+    Returns a fresh copy of the result dictionary.
+    """
+    result = _calculate_retirement_cached(
+        round(float(initial_investment), 2), round(float(annual_rate), 4), int(years),
+        round(float(yearly_contribution), 2))
+    return dict(result)
+
+@lru_cache(maxsize=256)
+def _calculate_retirement_yearly_cached(initial_investment, annual_rate, years, yearly_contribution, method):
+    yearly_with, yearly_without = calculate_retirement_yearly(
+        initial_investment, annual_rate, years, yearly_contribution, method)
+    return tuple(yearly_with), tuple(yearly_without)
+
+def calculate_retirement_yearly_cached(initial_investment, annual_rate, years, yearly_contribution, method="loop"):
+    """
+    calculate_retirement_yearly backed by an LRU cache keyed on the rounded inputs.
+    Returns fresh lists, like calculate_retirement_yearly.
+    """
+    yearly_with, yearly_without = _calculate_retirement_yearly_cached(
+        round(float(initial_investment), 2), round(float(annual_rate), 4), int(years),
+        round(float(yearly_contribution), 2), method)
+    return list(yearly_with), list(yearly_without)
+
+@lru_cache(maxsize=128)
+def _sweep_cached(initial_investment, rates, years, contributions, key):
+    rate_grid, years_grid, contribution_grid = np.meshgrid(
+        np.array(rates), np.array(years, dtype=int), np.array(contributions), indexing="ij")
+    results = calculate_retirement_batch(
+        initial_investment, rate_grid.ravel(), years_grid.ravel(), contribution_grid.ravel())
+    grid = results[key].reshape(rate_grid.shape)
+    grid.flags.writeable = False
+    return grid
+
+def sweep_retirement(initial_investment, annual_rates, years, yearly_contributions, key="balance_with_contrib"):
+    """
+    Evaluate calculate_retirement over the cartesian grid of annual_rates x years x yearly_contributions
+    in one vectorized pass. Each of the three may be a scalar or a sequence.
+    Returns a read-only array of the `key` result with one axis per sequence argument, in that order,
+    so passing one scalar gives a 2-D grid. Grids are LRU-cached on the rounded inputs.
+    """
+    grid = _sweep_cached(
+        round(float(initial_investment), 2), _rounded(annual_rates, 4),
+        tuple(int(val) for val in np.atleast_1d(years)), _rounded(yearly_contributions, 2), key)
+    scalar_axes = tuple(axis for axis, values in enumerate((annual_rates, years, yearly_contributions))
+                        if np.ndim(values) == 0)
+    return grid.squeeze(axis=scalar_axes) if scalar_axes else grid
+
+def sensitivity_grid(initial_investment, annual_rate, years, yearly_contribution, steps=2,
+                     rate_step=1.0, years_step=5, contribution_step=1000.0, key="balance_with_contrib"):
+    """
+    Sweep a (2*steps + 1)^3 grid centred on the current inputs.
+    Returns (rates, years, contributions, grid) where grid[i, j, k] is the `key` result
+    for rates[i], years[j] and contributions[k]. Years and contributions below zero are dropped.
+    """
+    offsets = np.arange(-steps, steps + 1)
+    rates = annual_rate + offsets * rate_step
+    horizons = years + offsets * years_step
+    horizons = horizons[horizons >= 0]
+    contributions = yearly_contribution + offsets * contribution_step
+    contributions = contributions[contributions >= 0]
+    grid = sweep_retirement(initial_investment, rates, horizons, contributions, key)
+    return rates, horizons, contributions, grid
+
+def self_check(scenarios=20000, seed=0):
+    """
+    Check the calculation paths against each other and return a list of failure messages
+    (empty when everything agrees). Covers the zero-rate and years <= 0 paths, the closed
+    form against the year-by-year loop, and cumprod and the batch functions against their
+    scalar counterparts, to the cent, over `scenarios` random inputs including tiny rates.
+    """
+    import random
+    rng = random.Random(seed)
+    failures = []
+
+    def check(ok, message):
+        if not ok:
+            failures.append(message)
+
+    for years in (0, -1, -10):
+        args = (1000.0, 5.0, years, 100.0)
+        check(_balance_with_contrib(*args) == 1000.0, f"closed form with years={years}")
+        check(calculate_retirement(*args)["balance_with_contrib"] == 1000.0, f"calculate_retirement with years={years}")
+        for method in ("loop", "cumprod"):
+            check(calculate_retirement_yearly(*args, method=method) == ([], []), f"{method} with years={years}")
+        check(calculate_retirement_batch(*args)["balance_with_contrib"].tolist() == [1000.0],
+              f"batch with years={years}")
+        yearly_with, yearly_without = calculate_retirement_yearly_batch(*args)
+        check(yearly_with.shape == yearly_without.shape == (1, 0), f"yearly batch with years={years}")
+    check(_balance_with_contrib(1000.0, 0, 30, 100.0) == 4000.0, "closed form at a zero rate")
+    check(calculate_retirement_yearly(1000.0, 0, 3, 100.0, method="cumprod") == ([1100.0, 1200.0, 1300.0],
+                                                                                  [1000.0, 1000.0, 1000.0]),
+          "cumprod at a zero rate")
+
+    inputs = []
+    for _ in range(scenarios):
+        kind = rng.random()
+        if kind < 0.1:
+            rate = 0.0
+        elif kind < 0.3:
+            # Rates far below 0.01%, where the closed form's g^n - 1 would lose its digits.
+            rate = 10 ** rng.uniform(-9, -2)
+        else:
+            rate = round(rng.uniform(-5, 15), 2)
+        inputs.append((round(rng.uniform(0, 1e6), 2), rate, rng.randint(0, 60), round(rng.uniform(0, 5e4), 2)))
+    batch = calculate_retirement_batch(*zip(*inputs))
+    yearly_with_batch, yearly_without_batch = calculate_retirement_yearly_batch(*zip(*inputs))
+    for i, args in enumerate(inputs):
+        initial, rate, years, contribution = args
+        loop = calculate_retirement_yearly(*args)
+        check(calculate_retirement_yearly(*args, method="cumprod") == loop, f"cumprod != loop for {args}")
+        # The closed form must land within half a cent of the unrounded loop balance.
+        balance = initial
+        for _ in range(years):
+            balance = (balance + contribution) * (1 + rate / 100)
+        check(abs(_balance_with_contrib(*args) - balance) <= 0.005, f"closed form != loop for {args}")
+        result = calculate_retirement(*args)
+        check({key: float(values[i]) for key, values in batch.items()} == result, f"batch != scalar for {args}")
+        check((yearly_with_batch[i, :years].tolist(), yearly_without_batch[i, :years].tolist()) == loop,
+              f"yearly batch != loop for {args}")
+    return failures
+
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--check"]:
+        problems = self_check()
+        for problem in problems:
+            print(problem)
+        print(f"{len(problems)} problems" if problems else "All calculation paths agree.")
+        exit(1 if problems else 0)
     try:
         initial_investment = float(input("Enter starting amount: "))
         annual_rate = float(input("Enter annual rate (in %): "))
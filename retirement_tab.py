@@ -0,0 +1,217 @@
+import datetime
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QPushButton, QLabel, QFormLayout
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+from database import release_thread
+from instrumentation import timed
+from retirement_calculator import calculate_retirement_cached, calculate_retirement_yearly_cached
+from charts import BarChartWidget
+
+
+# --- Background worker for the Retirement tab's calculate & save pipeline ---
+class RetirementWorkerSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class RetirementWorker(QRunnable):
+    """
+    Runs the calculation and the database save off the GUI thread.
+    latest_request is a callable returning the newest request id for the same user; a worker
+    whose id is no longer the newest skips its remaining work, since a later save of that user
+    overwrites it anyway.
+    """
+
+    def __init__(self, request_id, latest_request, dm, user_id, initial, rate, years, contribution):
+        super().__init__()
+        self.signals = RetirementWorkerSignals()
+        self.request_id = request_id
+        self.latest_request = latest_request
+        self.dm = dm
+        self.user_id = user_id
+        self.inputs = (initial, rate, years, contribution)
+
+    def isStale(self):
+        return self.request_id != self.latest_request()
+
+    @timed("RetirementWorker.run")
+    def run(self):
+        if self.isStale():
+            return
+        try:
+            # Shares the preview's caches, so saving inputs that were just previewed skips the maths.
+            result = calculate_retirement_cached(*self.inputs)
+            yearly_with, yearly_without = calculate_retirement_yearly_cached(*self.inputs)
+            if self.isStale():
+                return
+            self.dm.upsert_retirement_result(self.user_id, *self.inputs, result)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+        finally:
+            release_thread()
+        self.signals.finished.emit(self.request_id, {
+            "result": result,
+            "yearly_with": yearly_with,
+            "yearly_without": yearly_without,
+            "saved_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+
+# --- Retirement Calculator Tab Widget ---
+class RetirementTabWidget(QWidget):
+    # Typing pause before the preview recomputes, and the longest horizon the preview charts
+    # year by year (the result itself is closed form and cheap for any horizon).
+    previewDelay = 150
+    previewMaxYears = 1000
+
+    def __init__(self, dm, user_id, parent=None):
+        super().__init__(parent)
+        self.dm = dm
+        self.user_id = user_id
+        # A single worker thread keeps saves in order; the request counter lets newer
+        # requests supersede ones still queued or running. latestSave maps each user to their
+        # newest request, so only that user's own later saves supersede a save, and
+        # sessionStart is the first request of the current session, so results from before a
+        # logout are not shown to the next user.
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.latestRequest = 0
+        self.latestSave = {}
+        self.sessionStart = 0
+        # Edits restart a single-shot timer, so a burst of keystrokes triggers one preview.
+        self.previewTimer = QTimer(self)
+        self.previewTimer.setSingleShot(True)
+        self.previewTimer.setInterval(self.previewDelay)
+        self.previewTimer.timeout.connect(self.updatePreview)
+        self.initUI()
+        self.loadData()
+
+    def initUI(self):
+        self.layout = QVBoxLayout()
+        self.lastSavedLabel = QLabel("Last Saved: N/A")
+        formLayout = QFormLayout()
+        self.initialEdit = QLineEdit()
+        self.rateEdit = QLineEdit()
+        self.yearsEdit = QLineEdit()
+        self.contributionEdit = QLineEdit()
+        self.calculateButton = QPushButton("Calculate & Save")
+        self.resultLabel = QLabel("")
+        formLayout.addRow("Starting Amount:", self.initialEdit)
+        formLayout.addRow("Annual Rate (%):", self.rateEdit)
+        formLayout.addRow("Years:", self.yearsEdit)
+        formLayout.addRow("Yearly Contribution:", self.contributionEdit)
+        formLayout.addRow(self.calculateButton)
+        formLayout.addRow("Result:", self.resultLabel)
+        self.barChart = BarChartWidget()
+        self.layout.addWidget(self.lastSavedLabel)
+        self.layout.addLayout(formLayout)
+        self.layout.addWidget(self.barChart)
+        self.setLayout(self.layout)
+        self.calculateButton.clicked.connect(self.calculateAndSave)
+        for edit in (self.initialEdit, self.rateEdit, self.yearsEdit, self.contributionEdit):
+            edit.textChanged.connect(lambda text: self.previewTimer.start())
+
+    def setUser(self, user_id):
+        self.clear()
+        self.user_id = user_id
+        self.loadData()
+
+    def clear(self):
+        # Saves still in flight are written, but their results are no longer shown.
+        self.sessionStart = self.latestRequest + 1
+        for edit in (self.initialEdit, self.rateEdit, self.yearsEdit, self.contributionEdit):
+            edit.clear()
+        self.previewTimer.stop()
+        self.lastSavedLabel.setText("Last Saved: N/A")
+        self.resultLabel.setText("")
+        self.barChart.update_chart([], [])
+
+    def loadData(self):
+        data = self.dm.get_retirement_result(self.user_id)
+        if data:
+            self.lastSavedLabel.setText(f"Retirement Calculation Saved: {data.name}")
+            self.initialEdit.setText(str(data.starting_amount))
+            self.rateEdit.setText(str(data.annual_rate))
+            self.yearsEdit.setText(str(data.years))
+            self.contributionEdit.setText(str(data.yearly_contribution))
+            self.resultLabel.setText(self.resultText(data.result()))
+            try:
+                years = int(data.years)
+                initial = float(data.starting_amount)
+                rate = float(data.annual_rate)
+                contribution = float(data.yearly_contribution)
+                yearly_with, yearly_without = calculate_retirement_yearly_cached(initial, rate, years, contribution)
+                self.barChart.update_chart(yearly_with, yearly_without)
+            except Exception:
+                pass
+        # Filling in the saved inputs is not an edit, so it should not replace the saved result with a preview.
+        self.previewTimer.stop()
+
+    def readInputs(self):
+        try:
+            return (float(self.initialEdit.text()), float(self.rateEdit.text()), int(self.yearsEdit.text()),
+                    float(self.contributionEdit.text()))
+        except ValueError:
+            return None
+
+    def resultText(self, result):
+        return (
+            f"With Contribution: ${result['balance_with_contrib']}\n"
+            f"Without Contribution: ${result['balance_no_contrib']}\n"
+            f"Annual Withdrawal (With): ${result['annual_withdraw_with_contrib']}\n"
+            f"Annual Withdrawal (Without): ${result['annual_withdraw_no_contrib']}\n"
+            f"Monthly Withdrawal (With): ${result['monthly_withdraw_with_contrib']}\n"
+            f"Monthly Withdrawal (Without): ${result['monthly_withdraw_no_contrib']}"
+        )
+
+    @timed("RetirementTab.updatePreview")
+    def updatePreview(self):
+        # Recomputes on the GUI thread from the calculator caches and never touches the database;
+        # only calculateAndSave persists.
+        inputs = self.readInputs()
+        if inputs is None:
+            return
+        try:
+            result = calculate_retirement_cached(*inputs)
+            yearly = calculate_retirement_yearly_cached(*inputs) if 0 < inputs[2] <= self.previewMaxYears else None
+        except (ArithmeticError, ValueError):
+            return
+        self.resultLabel.setText("Preview (not saved):\n" + self.resultText(result))
+        if yearly is not None:
+            self.barChart.update_chart(*yearly)
+
+    @pyqtSlot()
+    @timed("RetirementTab.calculateAndSave")
+    def calculateAndSave(self):
+        self.previewTimer.stop()
+        inputs = self.readInputs()
+        if inputs is None:
+            self.resultLabel.setText("Invalid input.")
+            return
+        initial, rate, years, contribution = inputs
+        self.latestRequest += 1
+        self.latestSave[self.user_id] = self.latestRequest
+        worker = RetirementWorker(self.latestRequest, lambda user_id=self.user_id: self.latestSave[user_id],
+                                  self.dm, self.user_id, initial, rate, years, contribution)
+        worker.signals.finished.connect(self.onCalculationFinished)
+        worker.signals.failed.connect(self.onCalculationFailed)
+        self.resultLabel.setText("Calculating...")
+        self.pool.start(worker)
+
+    def isCurrent(self, request_id):
+        return request_id == self.latestRequest and request_id >= self.sessionStart
+
+    def onCalculationFinished(self, request_id, payload):
+        if not self.isCurrent(request_id):
+            return
+        result = payload["result"]
+        # The worker's save timestamp is used as the save name
+        current_time = payload["saved_at"]
+        self.resultLabel.setText(f"Retirement Results:\nSaved on: {current_time}\n" + self.resultText(result))
+        self.lastSavedLabel.setText(f"Retirement Calculation Saved: {current_time}")
+        self.barChart.update_chart(payload["yearly_with"], payload["yearly_without"])
+
+    def onCalculationFailed(self, request_id, message):
+        if not self.isCurrent(request_id):
+            return
+        self.resultLabel.setText(f"Save failed: {message}")
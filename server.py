@@ -0,0 +1,445 @@
+"""
+Local HTTP/JSON service for the retirement calculator, accounts and saved data, built on
+asyncio and the standard library only (no Qt).
+
+    python server.py [--host 127.0.0.1] [--port 8080] [--db app_data.db] [--db-workers 4] [--auth-workers 4]
+
+Endpoints (request and response bodies are JSON):
+
+    GET  /health
+    POST /retirement/calculate    {initial_investment, annual_rate, years, yearly_contribution, yearly?}
+    POST /users                   {email, first_name, last_name, password}
+    POST /login                   {email, password}; the response includes a session token
+    POST /logout                  ends the session of the token sent
+    GET  /users/<id>/retirement   PUT with the calculate body to recompute and save
+    GET  /users/<id>/budget       PUT with {incomes, expenses} to save
+
+The /users/<id>/... endpoints and /logout need "Authorization: Bearer <token>" with a token
+from /login for that user. Checking a token is an HMAC and one indexed lookup, so only
+/login and /users pay for bcrypt.
+
+The event loop only parses HTTP and routes. SQLite work runs on a bounded database executor
+and bcrypt on a bounded auth executor; when either has max_pending calls waiting, new
+requests get 503 instead of queueing without limit. Calculations from concurrent requests
+are gathered for up to batch_window seconds and computed in one calculate_retirement_batch
+call. Connections are HTTP/1.1 keep-alive, so clients can reuse them across requests.
+
+The service listens on localhost by default and speaks plain HTTP, so put it behind TLS before
+exposing it: session tokens are bearer credentials.
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from budget_manager import BudgetModel
+from data_manager import EXPENSE_CATEGORIES, DataManager
+from database import release_thread
+from retirement_calculator import calculate_retirement_batch, calculate_retirement_yearly_batch
+from user_manager import UserManager
+
+MAX_YEARS = 1000
+MAX_HEADER_BYTES = 16384
+MAX_BODY_BYTES = 1 << 20
+KEEP_ALIVE_TIMEOUT = 30
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+def _call_and_release(fn, args):
+    # Like the Qt workers, hand the thread's connection back after every call so a
+    # transaction left open by a failed call can never hold the write lock.
+    try:
+        return fn(*args)
+    finally:
+        release_thread()
+
+
+class BoundedExecutor:
+    """
+    Thread pool that refuses work instead of queueing it without limit: run() raises
+    HTTPError(503) once max_pending calls are queued or running.
+    """
+
+    def __init__(self, workers, max_pending, name):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.max_pending = max_pending
+        self.pending = 0
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Server busy, try again.")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, _call_and_release, fn, args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def compute_retirement_batch(inputs, want_yearly):
+    """
+    Compute results for a list of (initial, rate, years, contribution) tuples with one
+    vectorized call, plus yearly balances for the entries where want_yearly is true.
+    Returns one dict per input, matching calculate_retirement (and calculate_retirement_yearly).
+    """
+    initial, rates, horizons, contributions = (list(column) for column in zip(*inputs))
+    columns = {key: values.tolist() for key, values in
+               calculate_retirement_batch(initial, rates, horizons, contributions).items()}
+    results = [{key: columns[key][i] for key in columns} for i in range(len(inputs))]
+    yearly_rows = [i for i, wanted in enumerate(want_yearly) if wanted]
+    if yearly_rows:
+        yearly_with, yearly_without = calculate_retirement_yearly_batch(
+            [initial[i] for i in yearly_rows], [rates[i] for i in yearly_rows],
+            [horizons[i] for i in yearly_rows], [contributions[i] for i in yearly_rows])
+        for row, i in enumerate(yearly_rows):
+            years = max(horizons[i], 0)
+            results[i]["yearly_with"] = yearly_with[row, :years].tolist()
+            results[i]["yearly_without"] = yearly_without[row, :years].tolist()
+    return results
+
+
+class RetirementBatcher:
+    """
+    Collects calculation requests and resolves them all from a single compute_retirement_batch
+    call. While a batch is being computed, new requests wait up to `window` seconds (or until
+    max_batch are waiting) to join the next one; when the calculator is idle they are sent on
+    the next event loop pass, so a lone request is not delayed.
+    """
+
+    def __init__(self, executor, max_batch=1024, window=0.002):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.window = window
+        self.pending = []
+        self.timer = None
+        self.tasks = set()
+        self.running = 0
+
+    async def calculate(self, inputs, yearly=False):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((inputs, yearly, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.window if self.running else 0, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self.run(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run(self, batch):
+        self.running += 1
+        try:
+            results = await self.executor.run(
+                compute_retirement_batch, [inputs for inputs, _, _ in batch], [yearly for _, yearly, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.running -= 1
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _number(body, key, integer=False):
+    value = body.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{key}' must be a number.")
+    if integer:
+        if int(value) != value:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{key}' must be a whole number.")
+        return int(value)
+    return float(value)
+
+
+def _retirement_inputs(body):
+    inputs = (_number(body, "initial_investment"), _number(body, "annual_rate"),
+              _number(body, "years", integer=True), _number(body, "yearly_contribution"))
+    if not 0 <= inputs[2] <= MAX_YEARS:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'years' must be between 0 and {MAX_YEARS}.")
+    return inputs
+
+
+def _finite(result):
+    # Huge rates or horizons overflow to inf/NaN, which JSON cannot carry (and should not be saved).
+    for value in result.values():
+        if not all(math.isfinite(v) for v in (value if isinstance(value, list) else (value,))):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "The result is too large; use a lower rate or fewer years.")
+    return result
+
+
+def _string(body, key):
+    value = body.get(key)
+    if not isinstance(value, str) or not value:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{key}' is required.")
+    return value
+
+
+def _amounts(value, key):
+    if not isinstance(value, dict) or not all(
+            isinstance(amount, (int, float)) and not isinstance(amount, bool) and math.isfinite(amount)
+            for amount in value.values()):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{key}' must map names to amounts.")
+    return value
+
+
+def _bearer_token(headers):
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    return token.strip() if scheme.lower() == "bearer" else None
+
+
+class RetirementService:
+    def __init__(self, db_name="app_data.db", db_workers=4, auth_workers=4, max_pending=256,
+                 max_batch=1024, batch_window=0.002, write_behind=False):
+        self.dm = DataManager(db_name, write_behind=write_behind)
+        self.um = UserManager(db_name)
+        self.db = BoundedExecutor(db_workers, max_pending, "db")
+        self.auth = BoundedExecutor(auth_workers, max_pending, "auth")
+        # Vectorized batches run off the event loop too; NumPy releases the GIL in its kernels.
+        self.compute = BoundedExecutor(1, max_pending, "compute")
+        self.batcher = RetirementBatcher(self.compute, max_batch, batch_window)
+        self.routes = [
+            ("GET", re.compile(r"/health"), self.health),
+            ("POST", re.compile(r"/retirement/calculate"), self.calculate),
+            ("POST", re.compile(r"/users"), self.register),
+            ("POST", re.compile(r"/login"), self.login),
+            ("POST", re.compile(r"/logout"), self.logout),
+            ("GET", re.compile(r"/users/(\d+)/retirement"), self.get_retirement),
+            ("PUT", re.compile(r"/users/(\d+)/retirement"), self.save_retirement),
+            ("GET", re.compile(r"/users/(\d+)/budget"), self.get_budget),
+            ("PUT", re.compile(r"/users/(\d+)/budget"), self.save_budget),
+        ]
+
+    async def dispatch(self, method, path, body, headers=None):
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                if route_method == method:
+                    return await handler(body, headers or {}, *match.groups())
+                allowed = True
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND)
+
+    async def health(self, body, headers):
+        return HTTPStatus.OK, {"status": "ok"}
+
+    async def calculate(self, body, headers):
+        result = await self.batcher.calculate(_retirement_inputs(body), bool(body.get("yearly")))
+        return HTTPStatus.OK, _finite(result)
+
+    async def register(self, body, headers):
+        registered = await self.auth.run(
+            self.um.register_user, _string(body, "email"), _string(body, "first_name"),
+            _string(body, "last_name"), _string(body, "password"))
+        if not registered:
+            raise HTTPError(HTTPStatus.CONFLICT, "Email is already registered.")
+        user = await self.db.run(self.um.get_user, body["email"])
+        return HTTPStatus.CREATED, user.as_dict(exclude=("password",))
+
+    async def login(self, body, headers):
+        user, token = await self.auth.run(self.um.login, _string(body, "email"), _string(body, "password"))
+        if user is None:
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Incorrect email or password.")
+        return HTTPStatus.OK, dict(user.as_dict(exclude=("password",)), token=token)
+
+    async def logout(self, body, headers):
+        await self.authenticate(headers)
+        await self.db.run(self.um.revoke_session, _bearer_token(headers))
+        return HTTPStatus.OK, {"status": "logged out"}
+
+    async def authenticate(self, headers, user_id=None):
+        """Return the user of the request's session token; 401 without a valid one, 403 for another user's data."""
+        token = _bearer_token(headers)
+        user = await self.db.run(self.um.validate_session, token) if token else None
+        if user is None:
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "A valid session token is required.")
+        if user_id is not None and user.id != int(user_id):
+            raise HTTPError(HTTPStatus.FORBIDDEN)
+        return user
+
+    async def get_retirement(self, body, headers, user_id):
+        await self.authenticate(headers, user_id)
+        record = await self.db.run(self.dm.get_retirement_result, int(user_id))
+        if record is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "No saved retirement result.")
+        return HTTPStatus.OK, record.as_dict()
+
+    async def save_retirement(self, body, headers, user_id):
+        await self.authenticate(headers, user_id)
+        inputs = _retirement_inputs(body)
+        result = _finite(await self.batcher.calculate(inputs))
+        await self.db.run(self.dm.upsert_retirement_result, int(user_id), *inputs, result)
+        return HTTPStatus.OK, result
+
+    async def get_budget(self, body, headers, user_id):
+        await self.authenticate(headers, user_id)
+        def load():
+            summary = self.dm.get_budget_summary(int(user_id))
+            return summary, (self.dm.get_budget_items(int(user_id)) if summary else None)
+        summary, items = await self.db.run(load)
+        if summary is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "No saved budget.")
+        incomes, expenses = items
+        return HTTPStatus.OK, {
+            "name": summary.name,
+            "incomes": incomes,
+            "expenses": expenses,
+            "total_income": summary.total_income,
+            "total_expenses": summary.total_expenses,
+            "remaining_balance": summary.remaining_balance,
+        }
+
+    async def save_budget(self, body, headers, user_id):
+        await self.authenticate(headers, user_id)
+        incomes = _amounts(body.get("incomes", {}), "incomes")
+        expenses = body.get("expenses", {})
+        if not isinstance(expenses, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'expenses' must map categories to items.")
+        # Categories are normalized the way BudgetManager.add_expense does it.
+        normalized = {}
+        for category, items in expenses.items():
+            if category.capitalize() not in EXPENSE_CATEGORIES:
+                raise HTTPError(HTTPStatus.BAD_REQUEST,
+                                f"Unknown expense category '{category}'; use one of {', '.join(EXPENSE_CATEGORIES)}.")
+            normalized.setdefault(category.capitalize(), {}).update(_amounts(items, f"expenses.{category}"))
+        expenses = normalized
+        budget = BudgetModel()
+        budget.load(incomes, expenses)
+        totals = budget.totals()
+        await self.db.run(self.dm.upsert_budget_summary, int(user_id), budget.incomes, budget.expenses, totals)
+        return HTTPStatus.OK, totals
+
+    # --- HTTP/1.1 plumbing ---
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                       {"error": "Headers too large."}, False)
+                    return
+                keep_alive = await self.handle_request(head, reader, writer)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def handle_request(self, head, reader, writer):
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ")
+        except ValueError:
+            await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line."}, False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        try:
+            length = int(headers.get("content-length", 0))
+            if not 0 <= length <= MAX_BODY_BYTES:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            raw = await reader.readexactly(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON.")
+            if not isinstance(body, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object.")
+            status, payload = await self.dispatch(method, path, body, headers)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return False
+        except ValueError:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": "Bad request."}
+        except Exception as e:
+            print(f"Unhandled error for {method} {path}: {e!r}", file=sys.stderr)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+        await self.respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def respond(self, writer, status, payload, keep_alive):
+        try:
+            body = json.dumps(payload, allow_nan=False).encode()
+        except ValueError:
+            # A non-finite number from elsewhere (e.g. a result saved by the desktop app).
+            status = HTTPStatus.BAD_REQUEST
+            body = json.dumps({"error": "The response contains a number JSON cannot represent."}).encode()
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host="127.0.0.1", port=8080, ready=None):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        for executor in (self.compute, self.db, self.auth):
+            executor.shutdown()
+        self.dm.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default="app_data.db", help="SQLite database file.")
+    parser.add_argument("--db-workers", type=int, default=4, help="Threads for SQLite work.")
+    parser.add_argument("--auth-workers", type=int, default=4, help="Threads for bcrypt hashing.")
+    parser.add_argument("--max-pending", type=int, default=256,
+                        help="Calls allowed to wait per executor before answering 503.")
+    parser.add_argument("--batch-window", type=float, default=0.002,
+                        help="Seconds to gather calculations into one vectorized batch.")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="Queue saves and commit them in batches (see DataManager).")
+    args = parser.parse_args(argv)
+    service = RetirementService(args.db, args.db_workers, args.auth_workers, args.max_pending,
+                                batch_window=args.batch_window, write_behind=args.write_behind)
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Headless command line entry point. Nothing here imports PyQt5 or matplotlib, so it starts
+quickly on servers without a display.
+
+    python simplesaver.py batch [--db app_data.db] [--workers N] [--chunk-size 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from data_manager import DataManager
+from retirement_calculator import calculate_retirement_batch
+from budget_manager import BudgetModel
+
+
+def _read_chunks(dm, query, chunk_size):
+    # Keyset pagination on user_id: every chunk is a fresh indexed query, so rows written back
+    # between chunks never disturb the scan.
+    last_user_id = -1
+    while True:
+        rows = dm.conn.execute(query, (last_user_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_user_id = rows[-1][0]
+
+
+def recompute_retirement_chunk(rows):
+    """
+    Recompute (user_id, starting_amount, annual_rate, years, yearly_contribution) rows in one
+    vectorized call. Returns (recomputed rows, number of rows skipped for missing inputs).
+    """
+    complete = [row for row in rows if None not in row]
+    skipped = len(rows) - len(complete)
+    if not complete:
+        return [], skipped
+    user_ids, initial, rates, years, contributions = zip(*complete)
+    results = calculate_retirement_batch(initial, rates, years, contributions)
+    columns = {key: values.tolist() for key, values in results.items()}
+    return [
+        (user_id, initial[i], rates[i], years[i], contributions[i], {key: columns[key][i] for key in columns})
+        for i, user_id in enumerate(user_ids)
+    ], skipped
+
+
+def recompute_budget_chunk(rows):
+    """
+    Recompute totals for (user_id, incomes_json, expenses_json) rows.
+    Returns (recomputed rows, number of rows skipped for unreadable JSON).
+    """
+    recomputed = []
+    skipped = 0
+    for user_id, incomes_json, expenses_json in rows:
+        budget = BudgetModel()
+        try:
+            budget.load(json.loads(incomes_json or "{}"), json.loads(expenses_json or "{}"))
+        except (TypeError, ValueError, AttributeError):
+            # Unparseable or the wrong shape (e.g. a list); the saved row is left as it is.
+            skipped += 1
+            continue
+        recomputed.append((user_id, budget.incomes, budget.expenses, budget.totals()))
+    return recomputed, skipped
+
+
+def _run(dm, pool, label, count_query, read_query, recompute, save, chunk_size):
+    total = dm.conn.execute(count_query).fetchone()[0]
+    start = time.perf_counter()
+    done = skipped = 0
+    for recomputed, chunk_skipped in pool.imap(recompute, _read_chunks(dm, read_query, chunk_size)):
+        save(recomputed)
+        done += len(recomputed)
+        skipped += chunk_skipped
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed else 0
+        print(f"\r{label}: {done}/{total} users ({rate:,.0f} users/s)", end="", file=sys.stderr, flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"\r{label}: {done}/{total} users in {elapsed:.2f}s "
+          f"({(done / elapsed if elapsed else 0):,.0f} users/s, {skipped} skipped)", file=sys.stderr)
+    return done
+
+
+def batch(db_name="app_data.db", workers=None, chunk_size=2000, only=None):
+    """
+    Recompute every saved retirement result and budget summary and write them back.
+    Inputs are read in chunks, recomputed on a process pool and written with one
+    DataManager.update_results transaction per chunk, which keeps each user's save time and
+    history as they were. Returns the number of users updated per table.
+    """
+    dm = DataManager(db_name)
+    updated = {}
+    with Pool(workers or os.cpu_count()) as pool:
+        if only in (None, "retirement"):
+            updated["retirement"] = _run(
+                dm, pool, "retirement",
+                "SELECT COUNT(*) FROM retirement_results",
+                "SELECT user_id, starting_amount, annual_rate, years, yearly_contribution "
+                "FROM retirement_results WHERE user_id > ? ORDER BY user_id LIMIT ?",
+                recompute_retirement_chunk,
+                lambda rows: dm.update_results(retirement_results=rows),
+                chunk_size)
+        if only in (None, "budget"):
+            updated["budget"] = _run(
+                dm, pool, "budget",
+                "SELECT COUNT(*) FROM budget_summary",
+                "SELECT user_id, incomes, expenses FROM budget_summary WHERE user_id > ? ORDER BY user_id LIMIT ?",
+                recompute_budget_chunk,
+                lambda rows: dm.update_results(budget_summaries=rows),
+                chunk_size)
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="simplesaver")
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch_parser = commands.add_parser("batch", help="Recompute all saved retirement and budget results.")
+    batch_parser.add_argument("--db", default="app_data.db", help="SQLite database file.")
+    batch_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    batch_parser.add_argument("--chunk-size", type=int, default=2000, help="Users per chunk and transaction.")
+    batch_parser.add_argument("--only", choices=("retirement", "budget"), help="Recompute a single table.")
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        batch(args.db, args.workers, args.chunk_size, args.only)
+
+
+if __name__ == "__main__":
+    main()
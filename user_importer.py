@@ -0,0 +1,48 @@
+import csv
+import sys
+from user_manager import REGISTER_CHUNK_SIZE, UserManager
+
+USER_COLUMNS = ("email", "first_name", "last_name", "password")
+
+
+def read_users(f):
+    """
+    Yield (email, first_name, last_name, password) for each row of a CSV stream, one row at a
+    time. The header must name the four columns (in any order, any case); rows missing a
+    value yield None.
+    """
+    reader = csv.DictReader(f)
+    columns = {name.strip().lower(): name for name in reader.fieldnames or ()}
+    missing = [column for column in USER_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+    email_col, first_col, last_col, password_col = (columns[column] for column in USER_COLUMNS)
+    for row in reader:
+        # Everything but the password is trimmed; passwords are taken verbatim.
+        user = ((row[email_col] or "").strip(), (row[first_col] or "").strip(),
+                (row[last_col] or "").strip(), row[password_col] or "")
+        yield user if all(user) else None
+
+
+def import_users(um, path, workers=None, chunk_size=REGISTER_CHUNK_SIZE, progress=None):
+    """Register every user in a CSV file ("-" for stdin) with UserManager.register_users and return its stats."""
+    if path == "-":
+        return um.register_users(read_users(sys.stdin), workers, chunk_size, progress)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return um.register_users(read_users(f), workers, chunk_size, progress)
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python user_importer.py <users.csv|-> [workers]")
+        exit(1)
+    workers = int(sys.argv[2]) if len(sys.argv) == 3 else None
+    stats = import_users(UserManager(), sys.argv[1], workers=workers,
+                         progress=lambda n: print(f"\r{n} rows", end="", file=sys.stderr, flush=True))
+    duplicates = stats["duplicates"]
+    print(f"\nRegistered {stats['registered']} of {stats['rows']} users in {stats['seconds']}s "
+          f"({stats['rows_per_second']} users/s); {len(duplicates)} duplicate, {stats['invalid']} invalid",
+          file=sys.stderr)
+    # Duplicate emails go to stdout, one per line, so they can be redirected to a file.
+    for email in duplicates:
+        print(email)
+    exit(1 if duplicates or stats["invalid"] else 0)
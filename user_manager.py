@@ -1,10 +1,57 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
 import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 import bcrypt
+from database import get_provider
+from instrumentation import timed_methods
+from records import UserRecord
 
+# bcrypt cost factor for new hashes. Each hash stores its own cost, so raising this only
+# affects new passwords; older hashes are upgraded the next time their owner logs in.
+BCRYPT_ROUNDS = 12
+# bcrypt only reads the first 72 bytes of a password, and bcrypt 5 rejects longer ones.
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# Sessions stay valid this many seconds after login unless revoked first.
+SESSION_TTL = 12 * 60 * 60
+
+USER_SELECT = f"SELECT {', '.join(UserRecord.__slots__)} FROM users WHERE email = ?"
+# Bulk registration hashes and inserts this many users at a time.
+REGISTER_CHUNK_SIZE = 500
+# SQLite builds before 3.32 allow at most 999 parameters per statement.
+MAX_QUERY_PARAMS = 900
+
+SESSION_USER_SELECT = (
+    f"SELECT {', '.join('users.' + name for name in UserRecord.__slots__)} FROM sessions "
+    "JOIN users ON users.id = sessions.user_id WHERE sessions.id = ? AND sessions.expires_at > ?"
+)
+
+def _hash_password(password, rounds):
+    # Module level so ProcessPoolExecutor can pickle it for bulk registration.
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds))
+
+
+@timed_methods("UserManager")
 class UserManager:
-    def __init__(self, db_name="app_data.db"):
-        self.conn = sqlite3.connect(db_name)
+    def __init__(self, db_name="app_data.db", rounds=BCRYPT_ROUNDS, provider=None, session_ttl=SESSION_TTL):
+        self.provider = provider or get_provider(db_name)
+        self.rounds = rounds
+        self.session_ttl = session_ttl
+        self.cache = self.provider.cache
         self.create_table()
+        self.session_secret = self._load_session_secret()
+
+    @property
+    def conn(self):
+        # Hashing runs on worker threads (see AuthWorker); each thread gets its own
+        # pooled connection from the provider.
+        return self.provider.connection()
 
     def create_table(self):
         query = '''
@@ -17,41 +64,241 @@ class UserManager:
         )
         '''
         self.conn.execute(query)
+        # Session ids are the primary key, so checking a token is one index lookup; the
+        # user_id index serves revoking all of a user's sessions.
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id)")
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_secret (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            secret BLOB NOT NULL
+        )
+        ''')
+        self.conn.commit()
+
+    def _load_session_secret(self):
+        # One signing key per database, so every process sharing the database (the GUI and
+        # server.py) accepts the same tokens. The first process to start creates it.
+        self.conn.execute("INSERT OR IGNORE INTO session_secret (id, secret) VALUES (1, ?)",
+                          (secrets.token_bytes(32),))
         self.conn.commit()
+        return self.conn.execute("SELECT secret FROM session_secret WHERE id = 1").fetchone()[0]
+
+    def hash_password(self, password):
+        return _hash_password(password, self.rounds)
+
+    @staticmethod
+    def hash_rounds(stored_hash):
+        # bcrypt hashes look like b"$2b$12$...", where 12 is the cost factor.
+        return int(stored_hash.split(b"$")[2])
 
     def register_user(self, email, first_name, last_name, password):
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        hashed = self.hash_password(password)
         try:
             query = "INSERT INTO users (email, first_name, last_name, password) VALUES (?, ?, ?, ?)"
             self.conn.execute(query, (email, first_name, last_name, hashed))
             self.conn.commit()
+            # A lookup before registering may have cached "no such user".
+            self.cache.invalidate(("user", email))
             return True
         except sqlite3.IntegrityError:
+            # The failed INSERT leaves its implicit transaction open, holding the write lock.
+            self.conn.rollback()
             return False
 
+    def _registered_emails(self, emails):
+        # Answered from the UNIQUE index on users.email, MAX_QUERY_PARAMS emails per query.
+        found = set()
+        for start in range(0, len(emails), MAX_QUERY_PARAMS):
+            batch = emails[start:start + MAX_QUERY_PARAMS]
+            query = f"SELECT email FROM users WHERE email IN ({', '.join('?' * len(batch))})"
+            found.update(email for email, in self.conn.execute(query, batch))
+        return found
+
+    def register_users(self, users, workers=None, chunk_size=REGISTER_CHUNK_SIZE, progress=None):
+        """
+        Register many users at once. users is an iterable of (email, first_name, last_name,
+        password) tuples, or None for rows that could not be parsed; it is consumed chunk by
+        chunk, so it can stream from a file. Rows with an empty field or a password longer than
+        BCRYPT_MAX_PASSWORD_BYTES are counted as invalid and skipped.
+        Emails already registered, or repeated in users, are found with one indexed query per
+        chunk before any hashing and skipped. Passwords are hashed on a pool of `workers`
+        processes (default: one per core), and each chunk is inserted in one transaction
+        while the next chunk hashes. progress, if given, is called with the rows read so far
+        after every chunk.
+        Returns a stats dict: rows, registered, duplicates (list of emails), invalid, seconds
+        and rows_per_second.
+        """
+        start = time.perf_counter()
+        stats = {"rows": 0, "registered": 0, "duplicates": [], "invalid": 0}
+        seen = set()
+        iterator = iter(users)
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        try:
+            pending = None
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                stats["rows"] += len(chunk)
+                rows = []
+                for user in chunk:
+                    if (user is None or len(user) != 4 or not all(user)
+                            or len(user[3].encode('utf-8')) > BCRYPT_MAX_PASSWORD_BYTES):
+                        stats["invalid"] += 1
+                    elif user[0] in seen:
+                        stats["duplicates"].append(user[0])
+                    else:
+                        seen.add(user[0])
+                        rows.append(user)
+                taken = self._registered_emails([row[0] for row in rows])
+                stats["duplicates"].extend(row[0] for row in rows if row[0] in taken)
+                rows = [row for row in rows if row[0] not in taken]
+                passwords = [row[3] for row in rows]
+                if pool:
+                    hashes = pool.map(_hash_password, passwords, repeat(self.rounds),
+                                      chunksize=max(1, len(passwords) // (4 * workers)))
+                else:
+                    hashes = map(_hash_password, passwords, repeat(self.rounds))
+                if pending:
+                    self._insert_users(*pending, stats)
+                pending = (rows, hashes)
+                if progress:
+                    progress(stats["rows"])
+            if pending:
+                self._insert_users(*pending, stats)
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+        seconds = time.perf_counter() - start
+        stats["seconds"] = round(seconds, 3)
+        stats["rows_per_second"] = round(stats["rows"] / seconds) if seconds else stats["rows"]
+        return stats
+
+    def _insert_users(self, rows, hashes, stats):
+        hashes = list(hashes)
+        with self.conn:
+            # Take the write lock first, so emails registered elsewhere while this chunk was
+            # hashing are caught here rather than failing the INSERT.
+            self.conn.execute("BEGIN IMMEDIATE")
+            taken = self._registered_emails([row[0] for row in rows])
+            new = [(email, first_name, last_name, hashed)
+                   for (email, first_name, last_name, _), hashed in zip(rows, hashes) if email not in taken]
+            self.conn.executemany(
+                "INSERT INTO users (email, first_name, last_name, password) VALUES (?, ?, ?, ?)", new)
+        stats["registered"] += len(new)
+        stats["duplicates"].extend(row[0] for row in rows if row[0] in taken)
+        # Lookups before the import may have cached "no such user".
+        for email, *_ in new:
+            self.cache.invalidate(("user", email))
+
+    def _load_user(self, email):
+        cursor = self.conn.cursor()
+        cursor.row_factory = UserRecord.from_row
+        return cursor.execute(USER_SELECT, (email,)).fetchone()
+
     def get_user(self, email):
-        query = "SELECT * FROM users WHERE email = ?"
-        cursor = self.conn.execute(query, (email,))
-        result = cursor.fetchone()
-        return result
+        """Return the UserRecord for email, or None. Cached until the user is updated."""
+        return self.cache.get(("user", email), lambda: self._load_user(email))
 
     def validate_login(self, email, password):
-        user = self.get_user(email)
+        # Always checked against the stored row, never a cached copy of the hash.
+        user = self._load_user(email)
         if user:
-            stored_hash = user[4]
+            stored_hash = user.password
             if bcrypt.checkpw(password.encode('utf-8'), stored_hash):
+                if self.hash_rounds(stored_hash) < self.rounds:
+                    self.rehash_password(email, password)
                 return user
         return None
 
+    # --- Sessions ---
+    # A token is "<session id>.<expiry>.<signature>", the signature being an HMAC-SHA256 of the
+    # id and expiry under the database's session secret. Forged or expired tokens are turned
+    # away without touching the database; the rest need a live row in sessions, so deleting
+    # the row revokes the token at once.
+    def _sign(self, session_id, expires):
+        digest = hmac.new(self.session_secret, f"{session_id}.{expires}".encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def create_session(self, user_id):
+        """Start a session for user_id and return its token. Call only after the user has authenticated."""
+        now = time.time()
+        session_id = secrets.token_urlsafe(18)
+        expires = int(now + self.session_ttl)
+        self.conn.execute("DELETE FROM sessions WHERE user_id = ? AND expires_at <= ?", (user_id, now))
+        self.conn.execute("INSERT INTO sessions (id, user_id, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                          (session_id, user_id, now, expires))
+        self.conn.commit()
+        return f"{session_id}.{expires}.{self._sign(session_id, expires)}"
+
+    def login(self, email, password):
+        """Check the password once and return (user, session token), or (None, None)."""
+        user = self.validate_login(email, password)
+        if user is None:
+            return None, None
+        return user, self.create_session(user.id)
+
+    @staticmethod
+    def _parse_token(token):
+        try:
+            session_id, expires, signature = token.split(".")
+            return session_id, int(expires), signature
+        except (AttributeError, ValueError):
+            return None
+
+    def validate_session(self, token):
+        """Return the UserRecord a session token belongs to, or None if it is invalid, expired or revoked."""
+        parsed = self._parse_token(token)
+        if parsed is None:
+            return None
+        session_id, expires, signature = parsed
+        now = time.time()
+        # Compared as bytes: compare_digest rejects non-ASCII str arguments with TypeError.
+        expected = self._sign(session_id, expires).encode()
+        if expires <= now or not hmac.compare_digest(signature.encode('utf-8'), expected):
+            return None
+        cursor = self.conn.cursor()
+        cursor.row_factory = UserRecord.from_row
+        return cursor.execute(SESSION_USER_SELECT, (session_id, now)).fetchone()
+
+    def revoke_session(self, token):
+        parsed = self._parse_token(token)
+        if parsed is not None:
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (parsed[0],))
+            self.conn.commit()
+
+    def revoke_user_sessions(self, user_id):
+        self.conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+        self.conn.commit()
+
+    def rehash_password(self, email, password):
+        hashed = self.hash_password(password)
+        self.conn.execute("UPDATE users SET password = ? WHERE email = ?", (hashed, email))
+        self.conn.commit()
+        self.cache.invalidate(("user", email))
+
     def update_user_info(self, email, first_name, last_name, new_password=None):
         if new_password:
-            hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+            hashed = self.hash_password(new_password)
             query = "UPDATE users SET first_name = ?, last_name = ?, password = ? WHERE email = ?"
             self.conn.execute(query, (first_name, last_name, hashed, email))
+            # Sessions started with the old password end with it, in the same transaction.
+            self.conn.execute("DELETE FROM sessions WHERE user_id = (SELECT id FROM users WHERE email = ?)",
+                              (email,))
         else:
             query = "UPDATE users SET first_name = ?, last_name = ? WHERE email = ?"
             self.conn.execute(query, (first_name, last_name, email))
         self.conn.commit()
+        self.cache.invalidate(("user", email))
         return True
 
 if __name__ == "__main__":